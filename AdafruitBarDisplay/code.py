@@ -9,7 +9,11 @@ from framebufferio import FramebufferDisplay
 import wifi
 import socketpool
 import adafruit_requests
-import adafruit_imageload
+import bitmaptools
+try:
+    import jpegio  # ESP32-S3 builds of CircuitPython 9+ - other boards use the BMP renditions
+except ImportError:
+    jpegio = None
 import time
 import gc
 from io import BytesIO
@@ -37,18 +41,30 @@ WIFI_PASSWORD = SonosCredentials.WIFI_PASSWORD
 # IMAGE_URL = "http://192.168.86.60:8000/Adafruit/artwork_bar.bmp"
 # METADATA_URL = "http://192.168.86.60:8000/metadata.json"
 
-IMAGE_URL = "http://sonos-display.local:8000/Adafruit/artwork_bar.bmp"
-METADATA_URL = "http://sonos-display.local:8000/metadata.json"
+JPEG_IMAGE_URL = "http://sonos-display.local:8000/Adafruit/artwork_bar.jpg"  # Baseline JPEG for jpegio
+IMAGE_URL = "http://sonos-display.local:8000/Adafruit/artwork_bar_rle.bmp"  # RLE8, decoded while streaming
+BMP_IMAGE_URL = "http://sonos-display.local:8000/Adafruit/artwork_bar.bmp"  # Uncompressed fallback
+
+# Download formats in order of preference - the first one the server has is used
+IMAGE_SOURCES = [(IMAGE_URL, "rle8"), (BMP_IMAGE_URL, "bmp")]
+if jpegio:
+    IMAGE_SOURCES.insert(0, (JPEG_IMAGE_URL, "jpeg"))
+STATE_URL = "http://sonos-display.local:8000/state"  # Track + artwork hashes in one small JSON
+ART_BASE_URL = "http://sonos-display.local:8000"  # /state lists immutable /art/<hash> URLs relative to this
+WAIT_URL = "http://sonos-display.local:8000/wait"  # Long-poll /state: answers when metadata or artwork changes
 
 # Smart polling intervals
-METADATA_POLL_INTERVAL = 2   # Fast metadata polling for song detection
-FORCE_IMAGE_REFRESH_INTERVAL = 300  # 5 minutes
+METADATA_POLL_INTERVAL = 2   # Fallback polling when the server has no /wait long-poll
+FORCE_IMAGE_REFRESH_INTERVAL = 300  # Safety re-fetch, only while the server advertises no artwork hash
+WAIT_TIMEOUT = 60  # Seconds the server may hold a /wait before answering "no change"
 
 # Network settings
 HTTP_TIMEOUT = 15
 HTTP_DOWNLOAD_TIMEOUT = 180
 MAX_RETRIES = 3
 RETRY_DELAY = 3
+IMAGE_CHUNK_SIZE = 4096  # Bytes pulled from the socket per read while decoding
+BMP_BAND_ROWS = 16  # Rows of an uncompressed BMP decoded per bitmaptools.readinto call
 
 tprint("Starting Sonos Bar Display System...")
 tprint("Using bar display configuration (320x960)")
@@ -167,21 +183,21 @@ def reset_socket_pool():
     pool = socketpool.SocketPool(wifi.radio)
     requests = adafruit_requests.Session(pool)
 
-def http_request_with_retry(url, method="GET", timeout=HTTP_TIMEOUT, max_retries=MAX_RETRIES):
+def http_request_with_retry(url, method="GET", timeout=HTTP_TIMEOUT, max_retries=MAX_RETRIES, headers=None, slow_after=15):
     """HTTP request with retry logic and socket management"""
     for attempt in range(max_retries):
         try:
             start_time = time.monotonic()
 
             if method == "HEAD":
-                response = requests.head(url, timeout=timeout)
+                response = requests.head(url, headers=headers, timeout=timeout)
             else:
-                response = requests.get(url, timeout=timeout)
+                response = requests.get(url, headers=headers, timeout=timeout)
 
             elapsed = time.monotonic() - start_time
 
             # Check for slow responses (may indicate socket issues)
-            if elapsed > 15:
+            if elapsed > slow_after:
                 tprint(f"⚠️ Slow response ({elapsed:.1f}s) - resetting socket pool")
                 response.close()
                 reset_socket_pool()
@@ -211,7 +227,266 @@ last_displayed_metadata = {"album": "", "title": "", "artist": ""}  # Only updat
 pending_metadata = {"album": "", "title": "", "artist": ""}  # Metadata we want to display
 last_image_update = 0
 pending_display_data = None  # Stores downloaded image data awaiting display
-last_artwork_headers = {'last_modified': '', 'content_length': '0'}  # Track artwork changes
+state_etag = None  # ETag of the last /state answer, sent back as If-None-Match
+current_artwork = {}  # URL path -> {"hash", "size", "url"} of each rendition the server advertised
+artwork_track = None  # Track the advertised /art/ images were rendered for (None: same as current_metadata)
+displayed_artwork_hash = None  # Content hash of the image on screen
+displayed_artwork_path = None  # Fixed path of the format it was downloaded as (the preferred one may have 404ed)
+server_version = 0  # Change version from the last /state answer - 0 never matches, so the first wait returns at once
+
+def _refill(chunks, data, index, size):
+    """Drop consumed bytes and pull chunks until size bytes are available"""
+    data = data[index:]
+    while len(data) < size:
+        data += next(chunks)
+    return data, 0
+
+def download_chunks(response, url):
+    """Yield the body in IMAGE_CHUNK_SIZE pieces, resuming with a Range request if the link drops"""
+    etag = response.headers.get('etag')
+    total = int(response.headers.get('content-length', 0))
+    received = 0
+    resumes = 0
+    current = response
+    try:
+        while True:
+            try:
+                for chunk in current.iter_content(chunk_size=IMAGE_CHUNK_SIZE):
+                    received += len(chunk)
+                    yield chunk
+                if received >= total:
+                    return
+                error = "connection closed early"
+            except OSError as e:
+                error = e
+
+            # Only resume when If-Range can prove the server still has the same file
+            if not etag or not total or resumes >= MAX_RETRIES:
+                raise ValueError(f"Download failed at {received}/{total} bytes: {error}")
+            resumes += 1
+            tprint(f"⚠️ Download interrupted at {received}/{total} bytes ({error}) - resuming")
+            if current is not response:
+                current.close()
+            current = http_request_with_retry(url, method="GET", timeout=HTTP_DOWNLOAD_TIMEOUT,
+                                              headers={"Range": f"bytes={received}-", "If-Range": etag})
+            if not current or current.status_code != 206:
+                raise ValueError(f"Could not resume download: {current.status_code if current else 'no response'}")
+    finally:
+        # The caller closes the original response, resumed ones are ours
+        if current and current is not response:
+            try:
+                current.close()
+            except:
+                pass
+
+class BmpLoader:
+    """8-bit BMP decoder (plain or RLE8) writing into two Bitmap and Palette pairs reused for every image
+
+    Each image is decoded into the pair that is not on screen, and the pairs swap only once it has
+    decoded completely - a download that fails part way never tears the image being shown.
+    The header and color table are parsed once per image. Plain pixel rows are collected into a
+    reused band stream, and bitmaptools.readinto unpacks each band (padding, bottom-up order) in C.
+    """
+
+    def __init__(self):
+        self.bitmap = None  # Decode target - never the Bitmap on screen
+        self.palette = displayio.Palette(256)
+        self.shown = (None, displayio.Palette(256))  # Pair returned by the last successful load
+        self.band = None  # BMP_BAND_ROWS-row Bitmap that readinto fills before it is blitted into place
+        self.band_stream = BytesIO()  # Pixel bytes of one band - grown once, then rewritten in place
+        self.width = 0
+        self.height = 0  # Negative: rows stored top-down
+        self.compression = 0
+
+    def load(self, chunks):
+        """Decode the BMP arriving from chunks - returns (bitmap, palette)"""
+        try:
+            data, index = self.read_header(chunks)
+            if self.compression == 1:
+                self.read_rle8(chunks, data, index)
+            elif self.compression == 0:
+                self.read_rows(chunks, data, index)
+            else:
+                raise ValueError(f"Unsupported BMP compression {self.compression}")
+        except StopIteration:
+            raise ValueError("Image stream ended early")
+        # Complete - hand out the new pair and decode the next image into the one it replaces
+        decoded = (self.bitmap, self.palette)
+        self.bitmap, self.palette = self.shown
+        self.shown = decoded
+        return decoded
+
+    def read_header(self, chunks):
+        """Parse the header and load the color table into the Palette - returns (data, index) of the first pixel byte"""
+        data, index = _refill(chunks, b"", 0, 54)
+        if data[0:2] != b"BM":
+            raise ValueError("Not a BMP file")
+        pixel_offset = int.from_bytes(data[10:14], "little")
+        self.width = int.from_bytes(data[18:22], "little")
+        self.height = int.from_bytes(data[22:26], "little")
+        if self.height >= 0x80000000:
+            self.height -= 0x100000000
+        bits = int.from_bytes(data[28:30], "little")
+        self.compression = int.from_bytes(data[30:34], "little")
+        colors = int.from_bytes(data[46:50], "little") or 256
+        if bits != 8 or colors > 256:
+            raise ValueError(f"Expected an 8-bit BMP, got {bits}-bit with {colors} colors")
+
+        # Color table (BGRX entries), then skip to the pixel data
+        data, index = _refill(chunks, data, 54, colors * 4)
+        for i in range(colors):
+            blue, green, red = data[i * 4], data[i * 4 + 1], data[i * 4 + 2]
+            self.palette[i] = (red << 16) | (green << 8) | blue
+        data, index = _refill(chunks, data, 0, pixel_offset - 54)
+        self.allocate(self.width, abs(self.height))
+        return data, pixel_offset - 54
+
+    def allocate(self, width, height):
+        """Reallocate the target Bitmap and the band only when the image size changes"""
+        rows = min(BMP_BAND_ROWS, height)
+        while height % rows:
+            rows -= 1  # Bands tile the image exactly
+        if self.band is None or self.band.width != width or self.band.height != rows:
+            self.band = None
+            self.band = displayio.Bitmap(width, rows, 256)
+        if self.bitmap is not None and self.bitmap.width == width and self.bitmap.height == height:
+            return
+        self.bitmap = None  # Free the old pixels before allocating the new size
+        gc.collect()
+        self.bitmap = displayio.Bitmap(width, height, 256)
+
+    def read_rows(self, chunks, data, index):
+        """Uncompressed rows: fill a band of rows from the stream, readinto it, blit it into place"""
+        if not hasattr(bitmaptools, "readinto") or not hasattr(bitmaptools, "blit"):
+            self.read_rows_by_row(chunks, data, index)
+            return
+        band = self.band
+        stride = (self.width + 3) & ~3  # Each row is padded to a 4-byte boundary
+        band_bytes = stride * band.height
+        bottom_up = self.height > 0
+        y = self.bitmap.height - band.height if bottom_up else 0
+        stream = self.band_stream
+        stream.seek(0)
+        filled = 0
+        piece = memoryview(data)[index:]
+        while True:
+            while piece:
+                take = min(len(piece), band_bytes - filled)
+                stream.write(piece[:take])
+                filled += take
+                piece = piece[take:]
+                if filled == band_bytes:
+                    stream.seek(0)
+                    bitmaptools.readinto(band, stream, 8, element_size=4, reverse_rows=bottom_up)
+                    bitmaptools.blit(self.bitmap, band, 0, y)
+                    y += -band.height if bottom_up else band.height
+                    if y < 0 or y >= self.bitmap.height:
+                        return
+                    stream.seek(0)
+                    filled = 0
+            piece = memoryview(next(chunks))
+
+    def read_rows_by_row(self, chunks, data, index):
+        """Fallback for firmware without bitmaptools.readinto and blit: one arrayblit per row"""
+        width = self.width
+        stride = (width + 3) & ~3
+        rows = range(self.height - 1, -1, -1) if self.height > 0 else range(-self.height)
+        for y in rows:
+            if index + stride > len(data):
+                data, index = _refill(chunks, data, index, stride)
+            bitmaptools.arrayblit(self.bitmap, memoryview(data)[index:index + width], 0, y, width, y + 1)
+            index += stride
+
+    def read_rle8(self, chunks, data, index):
+        """BI_RLE8 runs: encoded runs are filled and literal runs copied by one C call each"""
+        self.bitmap.fill(0)  # Pixels the runs skip stay index 0, as in a new Bitmap
+        x = 0
+        y = self.height - 1
+        while y >= 0:
+            if index + 2 > len(data):
+                data, index = _refill(chunks, data, index, 2)
+            count = data[index]
+            value = data[index + 1]
+            index += 2
+            if count:
+                # Encoded run: one C call fills the whole span
+                bitmaptools.fill_region(self.bitmap, x, y, x + count, y + 1, value)
+                x += count
+            elif value == 0:  # End of line
+                x = 0
+                y -= 1
+            elif value == 1:  # End of bitmap
+                break
+            elif value == 2:
+                raise ValueError("RLE8 delta escapes are not supported")
+            else:
+                # Absolute run: copy the literal indices, padded to a 16-bit boundary
+                size = value + (value & 1)
+                if index + size > len(data):
+                    data, index = _refill(chunks, data, index, size)
+                bitmaptools.arrayblit(self.bitmap, memoryview(data)[index:index + value], x, y, x + value, y + 1)
+                x += value
+                index += size
+
+bmp_loader = BmpLoader()
+
+class JpegLoader:
+    """Baseline JPEG decoder (jpegio) writing into one RGB565 Bitmap and body buffer reused for every image"""
+
+    def __init__(self):
+        self.decoder = jpegio.JpegDecoder()
+        self.converter = displayio.ColorConverter(input_colorspace=displayio.Colorspace.RGB565_SWAPPED)
+        self.bitmap = None
+        self.buffer = bytearray(0)  # Compressed body - grown when a larger file arrives, never shrunk
+
+    def load(self, chunks, size):
+        """Collect the body arriving from chunks and decode it - returns (bitmap, converter)"""
+        if size > len(self.buffer):
+            self.buffer = None  # Free the old buffer before allocating the larger one
+            gc.collect()
+            self.buffer = bytearray((size + 4095) & ~4095)
+        buffer = memoryview(self.buffer)
+        received = 0
+        for chunk in chunks:
+            if received + len(chunk) > len(buffer):
+                raise ValueError(f"JPEG body is larger than its Content-Length ({size} bytes)")
+            buffer[received:received + len(chunk)] = chunk
+            received += len(chunk)
+        tprint(f"✅ Downloaded jpeg image: {received} bytes")
+
+        # jpegio reads the buffer in place (no BytesIO copy) and decodes straight into the 16-bit Bitmap
+        width, height = self.decoder.open(buffer[:received])
+        self.allocate(width, height)
+        self.decoder.decode(self.bitmap)
+        return self.bitmap, self.converter
+
+    def allocate(self, width, height):
+        """Reallocate the Bitmap only when the image size changes"""
+        if self.bitmap is not None and self.bitmap.width == width and self.bitmap.height == height:
+            return
+        self.bitmap = None  # Free the old pixels before allocating the new size
+        gc.collect()
+        self.bitmap = displayio.Bitmap(width, height, 65535)
+
+jpeg_loader = JpegLoader() if jpegio else None
+
+def load_image(response, image_format, image_url):
+    """Decode a downloaded image into (bitmap, pixel_shader)"""
+    chunks = download_chunks(response, image_url)
+    try:
+        return decode_image(response, image_format, chunks)
+    finally:
+        chunks.close()
+
+def decode_image(response, image_format, chunks):
+    """Decode the image body arriving from chunks"""
+    if image_format != "jpeg":
+        # Decode while streaming into the reused Bitmap - the file never sits in RAM
+        bitmap, palette = bmp_loader.load(chunks)
+        tprint(f"✅ Streamed {image_format} image: {response.headers.get('content-length', '?')} bytes")
+        return bitmap, palette
+
+    return jpeg_loader.load(chunks, int(response.headers.get('content-length', 0)))
 
 def show_status_message(message):
     """Display a working checkerboard status pattern for bar display"""
@@ -238,31 +513,67 @@ def show_status_message(message):
     display.refresh()  # Manual refresh
     tprint(f"Status displayed: {message}")
 
-def fetch_metadata():
-    """Fetch current song metadata"""
-    global current_metadata
+def url_path(url):
+    """"/Adafruit/artwork_bar.jpg" from a full image URL - the key /state uses"""
+    return "/" + url.split("/", 3)[3]
+
+def apply_state(state):
+    """Take the track and artwork hashes from a /state or /wait answer"""
+    global current_metadata, current_artwork, artwork_track, server_version
+    server_version = state.get("version", server_version)
+    # Safety: Ensure we never have None values that could break comparisons
+    current_metadata = {
+        "album": state.get("album", "") or "",
+        "title": state.get("title", "") or "",
+        "artist": state.get("artist", "") or ""
+    }
+    current_artwork = state.get("artwork") or {}
+    artwork_track = state.get("artwork_track")
+
+def artwork_metadata():
+    """The track the advertised artwork belongs to - the text of a new track arrives before its images"""
+    if not artwork_track:
+        return current_metadata.copy()
+    return {key: artwork_track.get(key) or "" for key in ("album", "title", "artist")}
+
+def image_source():
+    """(url, format, hash) of the preferred format the server advertises - hash None if it advertises none"""
+    for image_url, image_format in IMAGE_SOURCES:
+        rendition = current_artwork.get(url_path(image_url))
+        if rendition:
+            return image_url, image_format, rendition["hash"]
+    return IMAGE_SOURCES[0][0], IMAGE_SOURCES[0][1], None
+
+def artwork_url(image_url):
+    """The immutable /art/ URL /state lists for a rendition (its bytes never change), else the fixed URL"""
+    rendition = current_artwork.get(url_path(image_url))
+    if rendition and rendition.get("url"):
+        return ART_BASE_URL + rendition["url"]
+    return image_url
+
+def fetch_state():
+    """Fetch the current song metadata and artwork hashes in one request"""
+    global state_etag
     
-    response = http_request_with_retry(METADATA_URL, method="GET", timeout=HTTP_TIMEOUT)
+    headers = {"If-None-Match": state_etag} if state_etag else None
+    response = http_request_with_retry(STATE_URL, method="GET", timeout=HTTP_TIMEOUT, headers=headers)
+
+    if response and response.status_code == 304:
+        response.close()
+        tprint(f"✅ State unchanged: {current_metadata['title']} - {current_metadata['artist']}")
+        return True
 
     if response:
-        # DEBUG: Print metadata response headers
-        # tprint(f"📋 DEBUG: Metadata response status: {response.status_code}")
-        # tprint(f"📋 DEBUG: Metadata response headers:")
-        # for header_name, header_value in response.headers.items():
-        #     tprint(f"📋 DEBUG:   {header_name}: {header_value}")
-        
         try:
-            data = response.json()
-            # Safety: Ensure we never have None values that could break comparisons
-            current_metadata = {
-                "album": data.get("album", "") or "",
-                "title": data.get("title", "") or "",
-                "artist": data.get("artist", "") or ""
-            }
+            if response.status_code != 200:
+                tprint(f"❌ State fetch failed: HTTP {response.status_code}")
+                return False
+            apply_state(response.json())
+            state_etag = response.headers.get('etag')
             tprint(f"✅ Metadata: {current_metadata['title']} - {current_metadata['artist']}")
             return True
         except Exception as e:
-            tprint(f"❌ Metadata parse error: {e}")
+            tprint(f"❌ State parse error: {e}")
             return False
         finally:
             # Always close response to prevent socket leaks
@@ -272,8 +583,19 @@ def fetch_metadata():
                 pass
     return False
 
+def artwork_out_of_date():
+    """True when /state lists a hash other than the image on screen - with no hash, only after the safety interval"""
+    # Compare like with like: after a fallback the screen holds another format than image_source()
+    rendition = current_artwork.get(displayed_artwork_path) if displayed_artwork_path else None
+    if rendition:
+        return rendition["hash"] != displayed_artwork_hash
+    _, _, artwork_hash = image_source()
+    if artwork_hash is None:
+        return time.monotonic() - last_image_update > FORCE_IMAGE_REFRESH_INTERVAL
+    return artwork_hash != displayed_artwork_hash
+
 def check_if_image_needed():
-    """Determine if we need to download a new image based on metadata AND artwork changes"""
+    """Determine if we need to download a new image based on the advertised artwork hash"""
     global pending_metadata, last_image_update
 
     # DEBUG: Show current state
@@ -295,65 +617,51 @@ def check_if_image_needed():
     if album_changed:
         tprint(f"🔍 Album changed: '{last_displayed_metadata['album']}' → '{current_metadata['album']}'")
 
-    # Check if it's been too long since last image update
-    current_time = time.monotonic()
-    time_since_image_update = current_time - last_image_update
-    force_refresh = time_since_image_update > FORCE_IMAGE_REFRESH_INTERVAL
-
     # First run (no previous image)
     first_run = last_image_update == 0
 
     # DEBUG: Show timing info
-    tprint(f"🔍 Time since last image: {time_since_image_update:.1f}s (force refresh at {FORCE_IMAGE_REFRESH_INTERVAL}s)")
+    tprint(f"🔍 Time since last image: {time.monotonic() - last_image_update:.1f}s")
     
-    # NEW: Always check if artwork changed (independent of metadata)
-    tprint(f"🎨 Checking if artwork changed...")
-    artwork_changed = check_artwork_changed()
+    # Artwork hash from /state vs the image on screen - no request needed to tell
+    artwork_changed = artwork_out_of_date()
     
     # Decision logic:
-    # 1. Force refresh or first run → always update
-    # 2. Metadata changed → update  
-    # 3. Artwork changed (even with same metadata) → update
-    needs_update = force_refresh or first_run or song_changed or artwork_changed
+    # 1. First run → always update
+    # 2. Artwork hash changed (new song rendered, or new artwork for the same song) → update
+    # 3. Same hash → never re-download; without a hash, only after FORCE_IMAGE_REFRESH_INTERVAL
+    # 4. Metadata changed alone → wait: the server hasn't rendered the new bar yet
+    needs_update = first_run or artwork_changed
     
-    tprint(f"🔍 Decision factors: song_changed={song_changed}, artwork_changed={artwork_changed}, force_refresh={force_refresh}, first_run={first_run}")
+    tprint(f"🔍 Decision factors: song_changed={song_changed}, artwork_changed={artwork_changed}, first_run={first_run}")
     tprint(f"🔍 Final decision: needs_update={needs_update}")
 
-    # If we need to update, set the pending metadata
-    if needs_update:
-        pending_metadata = current_metadata.copy()
-        tprint(f"🔍 Image update needed - setting pending metadata")
-    else:
-        tprint(f"🔍 No image update needed")
+    # The image we get back belongs to the track /state says it was rendered for
+    pending_metadata = artwork_metadata()
+    if pending_metadata != current_metadata:
+        tprint(f"⏳ Artwork for '{current_metadata['title']}' is still rendering")
 
     return needs_update, song_changed
 
 def download_and_display_image():
     """Download image and attempt immediate display"""
-    global last_displayed_metadata, last_image_update
-
-    # Direct image download with retry logic
-    response = http_request_with_retry(IMAGE_URL, method="GET", timeout=HTTP_DOWNLOAD_TIMEOUT)
-
+    global last_displayed_metadata, last_image_update, displayed_artwork_hash, displayed_artwork_path
+
+    # Direct image download with retry logic - formats /state doesn't list are skipped
+    sources = [source for source in IMAGE_SOURCES if url_path(source[0]) in current_artwork] or IMAGE_SOURCES
+    response = None
+    for source_url, image_format in sources:
+        image_url = artwork_url(source_url)
+        response = http_request_with_retry(image_url, method="GET", timeout=HTTP_DOWNLOAD_TIMEOUT)
+        if response and response.status_code == 404:
+            tprint(f"⚠️ No {image_format} artwork on server - trying the next format")
+            response.close()
+            continue
+        break
+    
     if response and response.status_code == 200:
         try:
-            # Read image data
-            image_data = response.content
-            tprint(f"✅ Downloaded image: {len(image_data)} bytes")
-
-            # Validate response content before processing
-            if len(image_data) < 1000:  # Less than 1KB probably indicates error
-                tprint(f"✗ Downloaded content too small: {len(image_data)} bytes")
-                return False
-            
-            # Create BytesIO object from downloaded data
-            image_file = BytesIO(image_data)
-            
-            # Load the image using adafruit_imageload from memory
-            bitmap, palette_or_converter = adafruit_imageload.load(image_file, 
-                                                                 bitmap=displayio.Bitmap, 
-                                                                 palette=displayio.Palette)
-            image_file.close()
+            bitmap, palette_or_converter = load_image(response, image_format, image_url)
             
             # Validate the loaded image
             if not bitmap or bitmap.width == 0 or bitmap.height == 0:
@@ -374,6 +682,8 @@ def download_and_display_image():
             # Update tracking ONLY after successful display
             last_displayed_metadata = pending_metadata.copy()
             last_image_update = time.monotonic()
+            displayed_artwork_hash = (response.headers.get('etag') or "").strip('"')
+            displayed_artwork_path = url_path(source_url)
 
             tprint(f"✅ Displayed: {pending_metadata['title']} by {pending_metadata['artist']}")
             return True
@@ -398,18 +708,49 @@ def download_and_display_image():
             tprint("❌ No response received")
         return False
 
-def smart_update_cycle():
+def wait_for_change():
+    """Long-poll /wait - True on a change (state applied), False on timeout, None if unavailable"""
+    global state_etag
+    
+    url = f"{WAIT_URL}?since={server_version}&timeout={WAIT_TIMEOUT}"
+    response = http_request_with_retry(url, method="GET", timeout=WAIT_TIMEOUT + HTTP_TIMEOUT,
+                                       max_retries=1, slow_after=WAIT_TIMEOUT + HTTP_TIMEOUT)
+    if not response:
+        return None
+    
+    try:
+        if response.status_code != 200:
+            tprint(f"⚠️ Long-poll unavailable (HTTP {response.status_code})")
+            return None
+        state = response.json()
+        if state["version"] == server_version:
+            return False
+        apply_state(state)
+        state_etag = response.headers.get('etag')
+        tprint(f"🔔 Change {server_version}: {current_metadata['title']} - {current_metadata['artist']}")
+        return True
+    except Exception as e:
+        tprint(f"❌ Long-poll error: {e}")
+        return None
+    finally:
+        try:
+            response.close()
+        except:
+            pass
+
+def smart_update_cycle(metadata_known=False):
     """Smart polling: check metadata first, then download if needed"""
     global last_displayed_metadata, last_image_update
 
     try:
-        # Always check metadata first (lightweight operation)
-        tprint("📋 Checking metadata...")
-        metadata_success = fetch_metadata()
+        # Check metadata and artwork hashes first (one small request) - a /wait answer already carried them
+        if not metadata_known:
+            tprint("📋 Checking state...")
+            state_success = fetch_state()
 
-        if not metadata_success:
-            tprint("❌ Metadata fetch failed")
-            return False
+            if not state_success:
+                tprint("❌ State fetch failed")
+                return False
 
         # Check if we need to download new image
         tprint("🔍 Checking if image update is needed...")
@@ -419,7 +760,7 @@ def smart_update_cycle():
             tprint(f"🎵 Song changed detected!")
 
         if not needs_image:
-            tprint("✓ Metadata only - no image update needed")
+            tprint("✓ Artwork on screen is current - no image update needed")
             return True
 
         # Download and display image
@@ -437,85 +778,44 @@ def smart_update_cycle():
         tprint(f"❌ Smart update error: {e}")
         return False
 
-def check_artwork_changed():
-    """Check if artwork has actually changed on server using HTTP headers"""
-    global last_artwork_headers
-    
-    try:
-        # Use HEAD request to get headers without downloading the image
-        tprint(f"🎨 Making HEAD request to {IMAGE_URL}...")
-        response = http_request_with_retry(IMAGE_URL, method="HEAD", timeout=HTTP_TIMEOUT)
-        
-        if response:
-            # DEBUG: Print ALL response headers
-            #tprint(f"🎨 DEBUG: Response status: {response.status_code}")
-            #tprint(f"🎨 DEBUG: All response headers:")
-            #for header_name, header_value in response.headers.items():
-            #    tprint(f"🎨 DEBUG:   {header_name}: {header_value}")
-            
-            # Get Last-Modified header (headers are lowercase in adafruit_requests)
-            last_modified = response.headers.get('last-modified', '')
-            content_length = response.headers.get('content-length', '0')
-            
-            tprint(f"🎨 Server headers: Last-Modified='{last_modified}', Content-Length='{content_length}'")
-            tprint(f"🎨 Stored headers: Last-Modified='{last_artwork_headers['last_modified']}', Content-Length='{last_artwork_headers['content_length']}'")
-            
-            # Check if artwork has actually changed
-            artwork_changed = (
-                last_modified != last_artwork_headers['last_modified'] or
-                content_length != last_artwork_headers['content_length']
-            )
-            
-            if artwork_changed:
-                tprint(f"🎨 Artwork changed detected:")
-                tprint(f"   Last-Modified: '{last_artwork_headers['last_modified']}' → '{last_modified}'")
-                tprint(f"   Content-Length: '{last_artwork_headers['content_length']}' → '{content_length}'")
-                
-                # Update tracking
-                last_artwork_headers['last_modified'] = last_modified
-                last_artwork_headers['content_length'] = content_length
-            else:
-                tprint(f"🎨 Artwork unchanged (headers match)")
-            
-            response.close()
-            return artwork_changed
-            
-        else:
-            tprint(f"❌ No response from artwork check")
-            return False  # Fixed: Don't assume change on network failure
-            
-    except Exception as e:
-        tprint(f"❌ Artwork check failed: {e}")
-        # Fixed: If we can't check, don't assume it changed (prevents false downloads)
-        return False
-        
-    return False  # Default to no change if check fails
-
 # Show initial status
 tprint("✓ Bar display initialized (320x960)")
 tprint("✓ WiFi connected")
 tprint(f"✓ Image URL: {IMAGE_URL}")
-tprint(f"✓ Metadata URL: {METADATA_URL}")
-tprint("✓ Smart polling: 2s metadata checks, images only on song changes")
+tprint(f"✓ State URL: {STATE_URL}")
+tprint(f"✓ Wait URL: {WAIT_URL}")
+tprint("✓ Smart polling: long-poll for changes, images only when the artwork changed")
 
 show_status_message("SMART POLLING - Waiting for metadata...")
 
-# Main loop - smart polling: metadata every 2 seconds, images only when needed
+# Main loop - long-poll: the server answers /wait as soon as metadata or artwork changes
 tprint("Starting smart Sonos monitoring...")
-tprint("📋 Metadata polling: 2 seconds")
-tprint("🖼️ Image downloads: Only on song changes or every 5 minutes")
+tprint(f"📋 Change notification: /wait long-poll ({WAIT_TIMEOUT}s), {METADATA_POLL_INTERVAL}s polling as fallback")
+tprint("🖼️ Image downloads: Only when the artwork hash changes")
 
+changed = None  # Last wait_for_change() result - None means poll the metadata ourselves
 while True:
     try:
-        success = smart_update_cycle()
+        # A wait that timed out with no change only needs a cycle if the image on screen is not the
+        # one the server lists - an unchanged image is never fetched again
+        if changed is not False or artwork_out_of_date():
+            success = smart_update_cycle(metadata_known=changed is True)
+            
+            if not success:
+                tprint("Update failed, retrying...")
+                tprint(f"🔄 Next check in {METADATA_POLL_INTERVAL}s")
+                time.sleep(METADATA_POLL_INTERVAL)
+                changed = None
+                continue
         
-        if not success:
-            tprint("Update failed, retrying...")
+        # Hold a request open until the server reports a change (or WAIT_TIMEOUT passes)
+        tprint(f"⏳ Waiting for changes after version {server_version}...")
+        changed = wait_for_change()
         
-        tprint(f"🔄 Next check in {METADATA_POLL_INTERVAL}s")
-
-        # Fast metadata polling for immediate song change detection
-        time.sleep(METADATA_POLL_INTERVAL)
+        if changed is None:
+            # Server without /wait or network trouble - fall back to fast metadata polling
+            tprint(f"🔄 Next check in {METADATA_POLL_INTERVAL}s")
+            time.sleep(METADATA_POLL_INTERVAL)
         
     except KeyboardInterrupt:
         tprint("Stopping smart monitoring...")
@@ -2,10 +2,20 @@
 
 import http.server
 import socketserver
+import asyncio
 import threading
+import ctypes
+import ctypes.util
+import struct
+import time
 import os
+import re
 import json
+import hashlib
 from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import urlsplit, parse_qs
+from http import HTTPStatus
 import signal
 import sys
 
@@ -15,9 +25,672 @@ DIRECTORY = "/home/deankondo/sonos-display"
 MAX_CONNECTIONS = 10  # Reduced from 20 to prevent resource exhaustion
 MAX_THREADS = 8  # Limit concurrent threads to prevent Raspberry Pi overload
 REQUEST_TIMEOUT = 30  # Timeout for requests in seconds
+SERVER_MODE = "asyncio"  # "asyncio": one event loop with keep-alive, "threaded": thread per connection
+KEEPALIVE_IDLE_TIMEOUT = 15  # Close idle keep-alive connections after this many seconds
+MAX_REQUEST_HEADERS = 50  # Reject requests with more header lines than this
+MAX_HEADER_LINE = 8192  # Longest request or header line accepted (431 beyond it)
+MAX_REQUEST_BODY = 64 * 1024  # Larger request bodies aren't read - the connection is closed after the reply
+CHUNK_SIZE = 4096  # File streaming chunk size (4KB for better Raspberry Pi performance)
+USE_SENDFILE = hasattr(os, 'sendfile')  # Zero-copy file bodies from the kernel; CHUNK_SIZE writes otherwise
+RESPONSE_CACHE_MAX_FILE_BYTES = 2 * 1024 * 1024  # Larger files are streamed from disk instead
+CACHE_POLL_INTERVAL = 1  # Seconds between stat checks when inotify is unavailable (e.g. macOS)
+METADATA_FILE = 'Adafruit/current_metadata.json'
+WAIT_TIMEOUT = 60  # Longest a /wait long-poll is held open before answering "no change"
+CHANGE_SETTLE_DELAY = 0.25  # Let a burst of rendition writes land before answering a /wait
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)  # Seconds; /wait lands high
+NOT_MODIFIED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Access-Control-Allow-Origin')  # Kept on 304s
+
+# Content-addressed rendition copies published by get_metadata_soco.py: /art/<16 hex digits of SHA-1><encoding>
+ART_DIR = 'Adafruit/art'
+ART_URL = re.compile(r'/art/([0-9a-f]{16})(\.rle\.bmp|\.bmp|\.jpg)')
+ART_CONTENT_TYPES = {'.bmp': 'image/bmp', '.rle.bmp': 'image/bmp', '.jpg': 'image/jpeg'}
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'  # A URL's bytes never change
+
+# Served artwork files: URL path -> (file under DIRECTORY, content type)
+ARTWORK_FILES = {
+    '/Adafruit/artwork_bar.bmp': ('Adafruit/artwork_bar.bmp', 'image/bmp'),
+    '/Adafruit/artwork.bmp': ('Adafruit/artwork.bmp', 'image/bmp'),
+    '/Adafruit/artwork_bar_rle.bmp': ('Adafruit/artwork_bar_rle.bmp', 'image/bmp'),
+    '/Adafruit/artwork_rle.bmp': ('Adafruit/artwork_rle.bmp', 'image/bmp'),
+    '/Adafruit/artwork_bar.jpg': ('Adafruit/artwork_bar.jpg', 'image/jpeg'),
+    '/Adafruit/artwork.jpg': ('Adafruit/artwork.jpg', 'image/jpeg'),
+}
+
+class Response:
+    """An HTTP response independent of the server front-end: status, headers, and a bytes or file body"""
+    
+    def __init__(self, status, headers=None, body=b"", file_path=None, file_size=0, label=None, file_offset=0):
+        self.status = status
+        self.headers = headers or []  # (name, value) pairs - Connection is added by the front-end
+        self.body = body
+        self.file_path = file_path  # Streamed from disk instead of body when set
+        self.file_size = file_size  # Bytes of the file to send, starting at file_offset
+        self.file_offset = file_offset
+        self.label = label  # Name used in the "Served ..." log line for file bodies
+    
+    def file_chunks(self):
+        """Read the file body in CHUNK_SIZE pieces, limited to file_offset .. file_offset + file_size"""
+        remaining = self.file_size
+        with open(self.file_path, 'rb') as f:
+            f.seek(self.file_offset)
+            while remaining > 0:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+def error_response(status, message):
+    """HTML error page, same format as http.server's send_error"""
+    status = HTTPStatus(status)
+    body = (http.server.DEFAULT_ERROR_MESSAGE % {
+        'code': status.value, 'message': message, 'explain': status.description,
+    }).encode('utf-8', 'replace')
+    return Response(status.value, [
+        ('Content-Type', http.server.DEFAULT_ERROR_CONTENT_TYPE),
+        ('Content-Length', str(len(body))),
+    ], body)
+
+def http_date(timestamp):
+    """Last-Modified value for a file modification time"""
+    return formatdate(timestamp, usegmt=True)
+
+def content_etag(data):
+    """Strong ETag derived from the body's SHA-1"""
+    return f'"{hashlib.sha1(data).hexdigest()[:16]}"'
+
+file_etags = {}  # Full path -> ((inode, size, mtime), ETag) so unchanged files aren't re-hashed
+
+def file_etag(full_path, stat):
+    """ETag of a file's contents, hashed again only when its stat signature changes"""
+    signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    cached = file_etags.get(full_path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    digest = hashlib.sha1()
+    with open(full_path, 'rb') as f:
+        while True:
+            chunk = f.read(64 * 1024)
+            if not chunk:
+                break
+            digest.update(chunk)
+    etag = f'"{digest.hexdigest()[:16]}"'
+    file_etags[full_path] = (signature, etag)
+    return etag
+
+def conditional_response(response, request_headers):
+    """304 Not Modified when If-None-Match (or, without it, If-Modified-Since) still matches"""
+    if response.status != 200:
+        return response
+    headers = dict(response.headers)
+    
+    if_none_match = request_headers.get('if-none-match')
+    if if_none_match is not None:
+        # Weak comparison, as RFC 9110 requires for If-None-Match
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        if '*' not in tags and headers.get('ETag') not in tags:
+            return response
+    else:
+        if_modified_since = request_headers.get('if-modified-since')
+        last_modified = headers.get('Last-Modified')
+        if not if_modified_since or not last_modified:
+            return response
+        try:
+            if parsedate_to_datetime(last_modified) > parsedate_to_datetime(if_modified_since):
+                return response
+        except (TypeError, ValueError):
+            return response  # Unparseable date - ignore the header
+    
+    return Response(304, [(name, value) for name, value in response.headers if name in NOT_MODIFIED_HEADERS])
+
+def build_response(method, path, request_headers, server_info=""):
+    """Route a GET or HEAD request to its response - shared by the threaded and asyncio servers"""
+    if method not in ('GET', 'HEAD'):
+        return error_response(501, f"Unsupported method ({method})")
+    
+    if path == '/metrics':
+        return server_metrics.response()
+    if urlsplit(path).path in ('/state', '/wait'):
+        # For /wait the front-end has already held the request until a change or timeout
+        return conditional_response(state_response(), request_headers)
+    
+    # Metadata and artwork come prebuilt from memory while the cache is watching the files
+    if path in response_cache.sources:
+        return range_response(conditional_response(response_cache.get(path), request_headers), request_headers)
+    response = build_file_route(path)
+    if response:
+        return range_response(conditional_response(response, request_headers), request_headers)
+    if method == 'GET' and (path == '/' or path == '/status'):
+        return status_response(server_info)
+    return error_response(404, "File not found")
+
+def build_file_route(path):
+    """Build the metadata or artwork response straight from disk (None for any other path)"""
+    # Essential files only - proper header order in each response
+    if path == '/metadata.json':
+        return metadata_response()
+    if path in ARTWORK_FILES:
+        return file_response(*ARTWORK_FILES[path])
+    art = ART_URL.fullmatch(path)
+    if art:
+        # The name is the content hash, so it is also the ETag - nothing to hash on each request
+        content_hash, encoding = art.groups()
+        return file_response(f"{ART_DIR}/{content_hash}{encoding}", ART_CONTENT_TYPES[encoding],
+                             etag=f'"{content_hash}"', cache_control=IMMUTABLE_CACHE_CONTROL)
+    return None
+
+def range_response(response, request_headers):
+    """206 Partial Content for a single byte Range (honoring If-Range), 416 when it can't be satisfied"""
+    range_header = request_headers.get('range')
+    if response.status != 200 or not range_header:
+        return response
+    headers = dict(response.headers)
+    if headers.get('Accept-Ranges') != 'bytes':
+        return response
+    
+    # If-Range: the client's partial copy must still be this exact representation, else send it all
+    if_range = request_headers.get('if-range')
+    if if_range and if_range not in (headers.get('ETag'), headers.get('Last-Modified')):
+        return response
+    
+    units, _, spec = range_header.partition('=')
+    if units.strip().lower() != 'bytes' or ',' in spec:
+        return response  # Other units and multi-range requests get the whole file
+    size = response.file_size if response.file_path else len(response.body)
+    first, _, last = spec.strip().partition('-')
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+            if last and end < start:
+                return response  # Invalid range - ignored, as RFC 9110 allows
+        else:
+            start = max(size - int(last), 0)  # Suffix range: the last N bytes
+            end = size - 1
+    except ValueError:
+        return response
+    
+    if start >= size or end < start:
+        unsatisfiable = error_response(416, "Requested range not satisfiable")
+        unsatisfiable.headers.append(('Content-Range', f'bytes */{size}'))
+        return unsatisfiable
+    end = min(end, size - 1)
+    length = end - start + 1
+    
+    partial = []
+    for name, value in response.headers:
+        if name == 'Content-Length':
+            partial.append(('Content-Range', f'bytes {start}-{end}/{size}'))
+            value = str(length)
+        partial.append((name, value))
+    if response.file_path:
+        return Response(206, partial, file_path=response.file_path, file_size=length,
+                        label=response.label, file_offset=response.file_offset + start)
+    return Response(206, partial, memoryview(response.body)[start:end + 1], label=response.label)
+
+def wait_params(path):
+    """(since, timeout) for a /wait?since=<version>[&timeout=<seconds>] long-poll, None for other paths"""
+    url = urlsplit(path)
+    if url.path != '/wait':
+        return None
+    query = parse_qs(url.query)
+    try:
+        since = int(query['since'][0])
+    except (KeyError, ValueError):
+        since = None  # No usable version - answer right away with the current one
+    try:
+        timeout = min(max(float(query['timeout'][0]), 0), WAIT_TIMEOUT)
+    except (KeyError, ValueError):
+        timeout = WAIT_TIMEOUT
+    return since, timeout
+
+def state_response():
+    """Change version, track, and each artwork rendition's hash and size - answered by /state and /wait"""
+    state = {"version": change_notifier.version, "title": "", "artist": "", "album": "", "artwork": {},
+             "artwork_track": None}
+    art_urls = {}
+    try:
+        metadata = json.loads(build_response('GET', '/metadata.json', {}).body or b'{}')
+        for key in ("title", "artist", "album"):
+            state[key] = metadata.get(key) or ""
+        art_urls = metadata.get("artwork") or {}
+        if art_urls:
+            # The track the /art/ images were rendered for - behind title/artist/album while a new track renders
+            state["artwork_track"] = metadata.get("artwork_track")
+    except ValueError as e:
+        print(f"Error reading metadata for /state: {e}")
+    
+    # Hashes are the ETags without quotes - clients compare them to what is on screen.
+    # The metadata names the immutable copy of each rendition, with its size: the hash is in the URL,
+    # so no file is touched. The fixed path is the fallback for renditions not published yet
+    # (or producers that don't publish /art/ copies).
+    for path in ARTWORK_FILES:
+        entry = art_urls.get(path)
+        art = ART_URL.fullmatch(entry.get("url") or "") if isinstance(entry, dict) else None
+        if art and isinstance(entry.get("size"), int):
+            state["artwork"][path] = {"hash": art.group(1), "size": entry["size"], "url": entry["url"]}
+            continue
+        headers = dict(build_response('HEAD', path, {}).headers)
+        if 'ETag' in headers:
+            state["artwork"][path] = {"hash": headers['ETag'].strip('"'), "size": int(headers['Content-Length'])}
+    
+    data = json.dumps(state, separators=(',', ':')).encode()
+    return Response(200, [
+        ('Content-Type', 'application/json'),
+        ('Content-Length', str(len(data))),
+        ('ETag', content_etag(data)),
+        ('Cache-Control', 'no-cache'),
+        ('Access-Control-Allow-Origin', '*'),
+    ], data)
+
+def metadata_response():
+    """metadata.json with no-cache headers, or the default metadata when nothing has been written yet"""
+    try:
+        metadata_path = os.path.join(DIRECTORY, METADATA_FILE)
+        
+        if os.path.exists(metadata_path):
+            with open(metadata_path, 'rb') as f:
+                data = f.read()
+            
+            return Response(200, [
+                ('Content-Type', 'application/json'),
+                ('Content-Length', str(len(data))),
+                ('ETag', content_etag(data)),
+                ('Last-Modified', http_date(os.path.getmtime(metadata_path))),
+                ('Cache-Control', 'no-cache'),  # Always revalidate - the ETag makes that a cheap 304
+                ('Access-Control-Allow-Origin', '*'),
+            ], data)
+        
+        # Return default metadata
+        default_metadata = {
+            "title": "No music playing",
+            "artist": "",
+            "album": "",
+            "last_updated": 0
+        }
+        
+        data = json.dumps(default_metadata).encode()
+        return Response(200, [
+            ('Content-Type', 'application/json'),
+            ('Content-Length', str(len(data))),
+            ('ETag', content_etag(data)),
+            ('Cache-Control', 'no-cache'),
+            ('Access-Control-Allow-Origin', '*'),
+        ], data)
+            
+    except Exception as e:
+        print(f"Error serving metadata: {e}")
+        return error_response(500, "Internal server error")
+
+def file_response(filepath, content_type, etag=None, cache_control='public, max-age=5'):
+    """Artwork file with proper download headers - the body is streamed by the front-end"""
+    try:
+        full_path = os.path.join(DIRECTORY, filepath)
+        
+        if not os.path.exists(full_path):
+            return error_response(404, f"File not found: {filepath}")
+        
+        stat = os.stat(full_path)
+        file_size = stat.st_size
+        
+        # Check for incomplete files
+        if file_size < 1000:
+            print(f"Warning: {filepath} is small ({file_size} bytes), may be incomplete")
+        
+        return Response(200, [
+            ('Content-Type', content_type),
+            ('Content-Length', str(file_size)),
+            ('ETag', etag or file_etag(full_path, stat)),
+            ('Last-Modified', http_date(stat.st_mtime)),
+            # Proper download headers to fix Chrome "insecure download" issue
+            ('Content-Disposition', f'inline; filename="{os.path.basename(filepath)}"'),
+            ('Accept-Ranges', 'bytes'),
+            ('Cache-Control', cache_control),  # Very short for the fixed paths, forever for /art/
+            ('Access-Control-Allow-Origin', '*'),
+        ], file_path=full_path, file_size=file_size, label=filepath)
+        
+    except Exception as e:
+        print(f"❌ Error serving {filepath}: {e}")
+        return error_response(500, "Internal server error")
+
+def status_response(server_info):
+    """Status page"""
+    try:
+        metadata_path = os.path.join(DIRECTORY, 'Adafruit/current_metadata.json')
+        artwork_path = os.path.join(DIRECTORY, 'Adafruit/artwork_bar.bmp')
+        
+        status_info = {
+            "metadata_exists": os.path.exists(metadata_path),
+            "artwork_exists": os.path.exists(artwork_path),
+            "artwork_size": os.path.getsize(artwork_path) if os.path.exists(artwork_path) else 0,
+        }
+        
+        html = f"""
+        <!DOCTYPE html>
+        <html>
+        <head><title>Fixed Sonos Display Server</title></head>
+        <body>
+            <h1>Fixed Sonos Display Server</h1>
+            <p>Status: <strong>Running</strong></p>
+            <p>Time: {datetime.now().isoformat()}</p>
+            <h2>Files:</h2>
+            <ul>
+                <li><a href="/metadata.json">metadata.json</a> - {'✅' if status_info['metadata_exists'] else '❌'}</li>
+                <li><a href="/Adafruit/artwork_bar.bmp">artwork_bar.bmp</a> - {'✅' if status_info['artwork_exists'] else '❌'} ({status_info['artwork_size']} bytes)</li>
+                <li><a href="/metrics">metrics</a> (Prometheus text format)</li>
+            </ul>
+            <p>{server_info}</p>
+            <p><em>Fixed HTTP headers for proper downloads</em></p>
+        </body>
+        </html>
+        """
+        
+        data = html.encode()
+        return Response(200, [
+            ('Content-Type', 'text/html'),
+            ('Content-Length', str(len(data))),
+            ('Cache-Control', 'no-cache'),
+        ], data)
+        
+    except Exception as e:
+        print(f"❌ Error serving status: {e}")
+        return error_response(500, "Internal server error")
+
+class ServerMetrics:
+    """Request, latency, byte, cache and connection counters, exported by /metrics in Prometheus text format"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = {}  # (endpoint, method, status) -> count
+        self.latency = {}  # endpoint -> per-bucket counts (last one is +Inf), then [sum, count]
+        self.bytes_served = {}  # endpoint -> body bytes sent
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.rejected = 0  # Connections refused by verify_request (threaded) or the connection limit (asyncio)
+        self.connections = 0
+    
+    @staticmethod
+    def endpoint(path):
+        """Label for a request path - unknown paths share one label so scanners can't grow the series"""
+        path = urlsplit(path).path
+        if path in ARTWORK_FILES or path in ('/', '/status', '/metadata.json', '/state', '/wait', '/metrics'):
+            return path
+        if ART_URL.fullmatch(path):
+            return '/art/'  # One label for every content-addressed copy
+        return 'other'
+    
+    @staticmethod
+    def method(method):
+        """Label for a request method - the asyncio front-end passes any verb a client sends"""
+        return method if method in ('GET', 'HEAD') else 'other'
+    
+    @staticmethod
+    def escape_label(value):
+        """Escape a label value for the Prometheus text format"""
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    
+    def observe(self, path, method, status, seconds, size):
+        endpoint = self.endpoint(path)
+        with self.lock:
+            key = (endpoint, self.method(method), status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            buckets, totals = self.latency.setdefault(endpoint, ([0] * (len(LATENCY_BUCKETS) + 1), [0.0, 0]))
+            buckets[next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))] += 1
+            totals[0] += seconds
+            totals[1] += 1
+            self.bytes_served[endpoint] = self.bytes_served.get(endpoint, 0) + size
+    
+    def count(self, name, amount=1):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + amount)
+    
+    def render(self):
+        with self.lock:
+            requests = dict(self.requests)
+            latency = {endpoint: (list(buckets), list(totals)) for endpoint, (buckets, totals) in self.latency.items()}
+            bytes_served = dict(self.bytes_served)
+            cache_hits, cache_misses = self.cache_hits, self.cache_misses
+            rejected, connections = self.rejected, self.connections
+        
+        lines = []
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP artwork_server_{name} {help_text}")
+            lines.append(f"# TYPE artwork_server_{name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ','.join(f'{key}="{self.escape_label(label)}"' for key, label in labels)
+                lines.append(f"artwork_server_{name}{suffix}{{{label_text}}} {value}" if label_text
+                             else f"artwork_server_{name}{suffix} {value}")
+        
+        metric("requests_total", "counter", "Requests answered, by endpoint, method and status",
+               [("", (("endpoint", endpoint), ("method", method), ("status", status)), count)
+                for (endpoint, method, status), count in sorted(requests.items())])
+        
+        samples = []
+        for endpoint, (buckets, (total_seconds, count)) in sorted(latency.items()):
+            cumulative = 0
+            for bound, bucket in zip(LATENCY_BUCKETS + ('+Inf',), buckets):
+                cumulative += bucket
+                samples.append(("_bucket", (("endpoint", endpoint), ("le", bound)), cumulative))
+            samples.append(("_sum", (("endpoint", endpoint),), f"{total_seconds:.6f}"))
+            samples.append(("_count", (("endpoint", endpoint),), count))
+        metric("request_duration_seconds", "histogram", "Time from request parsed to body sent (includes /wait holds)", samples)
+        
+        metric("response_bytes_total", "counter", "Body bytes sent, by endpoint",
+               [("", (("endpoint", endpoint),), size) for endpoint, size in sorted(bytes_served.items())])
+        
+        not_modified = sum(count for (_, _, status), count in requests.items() if status == 304)
+        answered = sum(count for (_, _, status), count in requests.items() if status in (200, 304))
+        metric("not_modified_ratio", "gauge", "Share of 200/304 answers that were 304 Not Modified",
+               [("", (), f"{not_modified / answered:.4f}" if answered else 0)])
+        
+        metric("response_cache_hits_total", "counter", "Metadata/artwork responses served from the in-memory cache",
+               [("", (), cache_hits)])
+        metric("response_cache_misses_total", "counter", "Metadata/artwork responses built from disk",
+               [("", (), cache_misses)])
+        lookups = cache_hits + cache_misses
+        metric("response_cache_hit_ratio", "gauge", "Share of response cache lookups that were hits",
+               [("", (), f"{cache_hits / lookups:.4f}" if lookups else 0)])
+        
+        metric("connections_rejected_total", "counter", "Connections refused for being over the thread/connection limit",
+               [("", (), rejected)])
+        metric("connections", "gauge", "Connections currently open", [("", (), connections)])
+        return '\n'.join(lines) + '\n'
+    
+    def response(self):
+        data = self.render().encode()
+        return Response(200, [
+            ('Content-Type', 'text/plain; version=0.0.4; charset=utf-8'),
+            ('Content-Length', str(len(data))),
+            ('Cache-Control', 'no-store'),
+        ], data)
+
+class ResponseCache:
+    """Prebuilt metadata and artwork responses in RAM, rebuilt only after the file changes on disk"""
+    
+    def __init__(self):
+        self.sources = {}  # URL path -> file under DIRECTORY; empty until a watcher is running
+        self.responses = {}  # URL path -> Response with the body loaded into memory
+        self.generations = {}  # URL path -> invalidation count, so a racing rebuild is not stored
+        self.lock = threading.Lock()
+    
+    def start(self):
+        """Begin caching, with inotify invalidation when available and a stat poller otherwise"""
+        sources = {path: filepath for path, (filepath, _) in ARTWORK_FILES.items()}
+        sources['/metadata.json'] = METADATA_FILE
+        watch_dir = os.path.join(DIRECTORY, 'Adafruit')
+        try:
+            watcher = InotifyWatcher(watch_dir, self.file_changed)
+            mode = "inotify"
+        except OSError as e:
+            print(f"⚠️ inotify unavailable ({e}) - polling files every {CACHE_POLL_INTERVAL}s")
+            watcher = StatPollWatcher([os.path.join(DIRECTORY, f) for f in sources.values()], self.file_changed)
+            mode = "stat polling"
+        self.sources = sources
+        threading.Thread(target=watcher.run, name="cache-watcher", daemon=True).start()
+        print(f"🧠 Response cache enabled ({mode}) for {len(sources)} paths")
+    
+    def get(self, path):
+        with self.lock:
+            response = self.responses.get(path)
+            generation = self.generations.get(path, 0)
+        if response is not None:
+            server_metrics.count('cache_hits')
+            return response
+        
+        server_metrics.count('cache_misses')
+        response = build_file_route(path)
+        if response.file_path and response.file_size <= RESPONSE_CACHE_MAX_FILE_BYTES:
+            try:
+                with open(response.file_path, 'rb') as f:
+                    body = f.read()
+            except OSError:
+                return response  # Replaced or removed while building - stream it uncached
+            if len(body) != response.file_size:
+                return response  # Read a file mid-replace - don't cache a torn body
+            response = Response(response.status, response.headers, body, label=response.label)
+        if response.status >= 500 or response.file_path:
+            return response  # Don't cache failures or files over the size limit
+        
+        with self.lock:
+            if self.generations.get(path, 0) == generation:
+                self.responses[path] = response
+        return response
+    
+    def file_changed(self, filename):
+        """Drop cached responses built from a file in the watched directory"""
+        filepath = f"Adafruit/{filename}"
+        changed = False
+        with self.lock:
+            for path, source in self.sources.items():
+                if source == filepath:
+                    self.responses.pop(path, None)
+                    self.generations[path] = self.generations.get(path, 0) + 1
+                    changed = True
+        if changed:
+            change_notifier.bump()
+
+class ChangeNotifier:
+    """Version counter for metadata and artwork changes, with blocking and asyncio waits for /wait"""
+    
+    def __init__(self):
+        # Starts from the clock so a restarted server never reuses a version a display already has
+        self.version = int(time.time() * 1000)
+        self.condition = threading.Condition()
+        self.async_waiters = set()  # (loop, future) pairs from the asyncio front-end
+    
+    def bump(self):
+        """Record a change and wake every waiting request (called from the watcher thread)"""
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+            waiters, self.async_waiters = self.async_waiters, set()
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(self.wake, future)
+    
+    @staticmethod
+    def wake(future):
+        if not future.done():
+            future.set_result(None)
+    
+    def wait(self, since, timeout):
+        """Block until the version differs from since or timeout passes (threaded front-end)"""
+        with self.condition:
+            if self.version != since:
+                return
+            changed = self.condition.wait_for(lambda: self.version != since, timeout)
+        if changed:
+            time.sleep(CHANGE_SETTLE_DELAY)
+    
+    async def wait_async(self, since, timeout):
+        """Same as wait() without blocking the event loop (asyncio front-end)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = (loop, future)
+        with self.condition:
+            if self.version != since:
+                return
+            self.async_waiters.add(waiter)
+        try:
+            await asyncio.wait_for(future, timeout)
+            await asyncio.sleep(CHANGE_SETTLE_DELAY)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self.condition:
+                self.async_waiters.discard(waiter)
+
+class InotifyWatcher:
+    """Linux inotify on one directory via ctypes - reports names that were written, moved in or deleted"""
+    
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, name length
+    
+    def __init__(self, directory, callback):
+        libc_name = ctypes.util.find_library('c')
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("libc has no inotify")
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch failed for {directory}")
+        self.directory = directory
+        self.callback = callback
+    
+    def run(self):
+        while True:
+            data = os.read(self.fd, 64 * 1024)
+            offset = 0
+            while offset < len(data):
+                _, mask, _, name_length = self.EVENT_HEADER.unpack_from(data, offset)
+                offset += self.EVENT_HEADER.size
+                name = data[offset:offset + name_length].rstrip(b'\0').decode('utf-8', 'replace')
+                offset += name_length
+                if mask & self.IN_Q_OVERFLOW:
+                    for filename in os.listdir(self.directory):  # Events were lost - drop everything
+                        self.callback(filename)
+                elif name:
+                    self.callback(name)
+
+class StatPollWatcher:
+    """Fallback watcher: compares (inode, size, mtime) of each file every CACHE_POLL_INTERVAL seconds"""
+    
+    def __init__(self, paths, callback):
+        self.paths = paths
+        self.callback = callback
+        self.signatures = {path: self.signature(path) for path in paths}
+    
+    @staticmethod
+    def signature(path):
+        try:
+            stat = os.stat(path)
+            return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            return None
+    
+    def run(self):
+        while True:
+            time.sleep(CACHE_POLL_INTERVAL)
+            for path in self.paths:
+                signature = self.signature(path)
+                if signature != self.signatures[path]:
+                    self.signatures[path] = signature
+                    self.callback(os.path.basename(path))
+
+server_metrics = ServerMetrics()
+response_cache = ResponseCache()
+change_notifier = ChangeNotifier()
 
 class FixedSonosHandler(http.server.SimpleHTTPRequestHandler):
-    """HTTP handler with proper header ordering and download support"""
+    """HTTP handler with proper header ordering and download support (threaded mode)"""
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=DIRECTORY, **kwargs)
@@ -28,243 +701,89 @@ class FixedSonosHandler(http.server.SimpleHTTPRequestHandler):
         thread_id = threading.current_thread().name
         print(f"[{timestamp}] [{thread_id}] {format % args}")
     
+    def setup(self):
+        super().setup()
+        server_metrics.count('connections')
+    
+    def finish(self):
+        try:
+            super().finish()
+        finally:
+            server_metrics.count('connections', -1)
+    
     def do_GET(self):
         """Handle GET requests with proper HTTP protocol"""
-        # Essential files only - proper header order in each method
-        if self.path == '/metadata.json':
-            self.serve_metadata()
-        elif self.path == '/Adafruit/artwork_bar.bmp':
-            self.serve_file('Adafruit/artwork_bar.bmp', 'image/bmp')
-        elif self.path == '/Adafruit/artwork.bmp':
-            self.serve_file('Adafruit/artwork.bmp', 'image/bmp')
-        elif self.path == '/' or self.path == '/status':
-            self.serve_status()
-        else:
-            self.send_error(404, "File not found")
+        start_time = time.perf_counter()
+        wait = wait_params(self.path)
+        if wait:
+            change_notifier.wait(*wait)  # Holds this thread - the async server holds no thread per wait
+        response = build_response('GET', self.path, self.headers, self.server_info())
+        size = self.send_built(response, head=False)
+        server_metrics.observe(self.path, 'GET', response.status, time.perf_counter() - start_time, size)
     
     def do_HEAD(self):
         """Handle HEAD requests for artwork change detection"""
-        if self.path == '/metadata.json':
-            self.serve_metadata_head()
-        elif self.path == '/Adafruit/artwork_bar.bmp':
-            self.serve_file_head('Adafruit/artwork_bar.bmp', 'image/bmp')
-        elif self.path == '/Adafruit/artwork.bmp':
-            self.serve_file_head('Adafruit/artwork.bmp', 'image/bmp')
-        else:
-            self.send_error(404, "File not found")
+        start_time = time.perf_counter()
+        response = build_response('HEAD', self.path, self.headers, self.server_info())
+        self.send_built(response, head=True)
+        server_metrics.observe(self.path, 'HEAD', response.status, time.perf_counter() - start_time, 0)
     
-    def serve_metadata(self):
-        """Serve metadata.json with proper headers"""
-        try:
-            metadata_path = os.path.join(DIRECTORY, 'Adafruit/current_metadata.json')
-            
-            if os.path.exists(metadata_path):
-                with open(metadata_path, 'r') as f:
-                    data = f.read()
-                
-                mod_time = os.path.getmtime(metadata_path)
-                last_modified = datetime.fromtimestamp(mod_time).strftime('%a, %d %b %Y %H:%M:%S GMT')
-                
-                # Proper HTTP header order: response, headers, end_headers, content
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Content-Length', str(len(data.encode())))
-                self.send_header('Last-Modified', last_modified)
-                self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.send_header('Connection', 'close')
-                self.end_headers()
-                self.wfile.write(data.encode())
-            else:
-                # Return default metadata
-                default_metadata = {
-                    "title": "No music playing",
-                    "artist": "",
-                    "album": "",
-                    "last_updated": 0
-                }
-                
-                json_data = json.dumps(default_metadata)
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Content-Length', str(len(json_data.encode())))
-                self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.send_header('Connection', 'close')
-                self.end_headers()
-                self.wfile.write(json_data.encode())
-                
-        except Exception as e:
-            print(f"Error serving metadata: {e}")
-            self.send_error(500, "Internal server error")
+    def server_info(self):
+        return f"Active threads: {threading.active_count()}"
     
-    def serve_file(self, filepath, content_type):
-        """Serve files with proper download headers and chunked transfer"""
-        try:
-            full_path = os.path.join(DIRECTORY, filepath)
-            
-            if not os.path.exists(full_path):
-                self.send_error(404, f"File not found: {filepath}")
-                return
-            
-            file_size = os.path.getsize(full_path)
-            mod_time = os.path.getmtime(full_path)
-            last_modified = datetime.fromtimestamp(mod_time).strftime('%a, %d %b %Y %H:%M:%S GMT')
-            
-            # Check for incomplete files
-            if file_size < 1000:
-                print(f"Warning: {filepath} is small ({file_size} bytes), may be incomplete")
-            
-            with open(full_path, 'rb') as f:
-                # Proper HTTP header order
-                self.send_response(200)
-                self.send_header('Content-Type', content_type)
-                self.send_header('Content-Length', str(file_size))
-                self.send_header('Last-Modified', last_modified)
-                # Proper download headers to fix Chrome "insecure download" issue
-                self.send_header('Content-Disposition', f'inline; filename="{os.path.basename(filepath)}"')
-                self.send_header('Accept-Ranges', 'bytes')
-                self.send_header('Cache-Control', 'public, max-age=5')  # Very short cache
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.send_header('Connection', 'close')
-                self.end_headers()
-                
-                # Stream file efficiently with timeout protection
-                bytes_sent = 0
-                chunk_size = 4096  # Reduced from 8KB to 4KB for better Raspberry Pi performance
-                
-                while True:
-                    chunk = f.read(chunk_size)
-                    if not chunk:
-                        break
-                    try:
-                        self.wfile.write(chunk)
-                        bytes_sent += len(chunk)
-                        # Flush periodically to prevent memory buildup
-                        if bytes_sent % (chunk_size * 10) == 0:
-                            self.wfile.flush()
-                    except BrokenPipeError:
-                        print(f"Client disconnected during {filepath} transfer")
-                        break
-                    except Exception as e:
-                        print(f"Error during {filepath} transfer: {e}")
-                        break
-                
-                print(f"✅ Served {filepath}: {bytes_sent}/{file_size} bytes (last_modified: {last_modified})")
-                    
-        except Exception as e:
-            print(f"❌ Error serving {filepath}: {e}")
-            self.send_error(500, "Internal server error")
-    
-    def serve_status(self):
-        """Serve status page"""
-        try:
-            metadata_path = os.path.join(DIRECTORY, 'Adafruit/current_metadata.json')
-            artwork_path = os.path.join(DIRECTORY, 'Adafruit/artwork_bar.bmp')
-            
-            active_threads = threading.active_count()
-            
-            status_info = {
-                "metadata_exists": os.path.exists(metadata_path),
-                "artwork_exists": os.path.exists(artwork_path),
-                "artwork_size": os.path.getsize(artwork_path) if os.path.exists(artwork_path) else 0,
-                "active_threads": active_threads
-            }
-            
-            html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head><title>Fixed Sonos Display Server</title></head>
-            <body>
-                <h1>Fixed Sonos Display Server</h1>
-                <p>Status: <strong>Running</strong></p>
-                <p>Time: {datetime.now().isoformat()}</p>
-                <h2>Files:</h2>
-                <ul>
-                    <li><a href="/metadata.json">metadata.json</a> - {'✅' if status_info['metadata_exists'] else '❌'}</li>
-                    <li><a href="/Adafruit/artwork_bar.bmp">artwork_bar.bmp</a> - {'✅' if status_info['artwork_exists'] else '❌'} ({status_info['artwork_size']} bytes)</li>
-                </ul>
-                <p>Active threads: {active_threads}</p>
-                <p><em>Fixed HTTP headers for proper downloads</em></p>
-            </body>
-            </html>
-            """
-            
-            self.send_response(200)
-            self.send_header('Content-Type', 'text/html')
-            self.send_header('Content-Length', str(len(html.encode())))
-            self.send_header('Cache-Control', 'no-cache')
-            self.send_header('Connection', 'close')
-            self.end_headers()
-            self.wfile.write(html.encode())
-            
-        except Exception as e:
-            print(f"❌ Error serving status: {e}")
-            self.send_error(500, "Internal server error")
+    def send_built(self, response, head):
+        """Send a shared Response: status, headers, end_headers, then the body unless HEAD - returns body bytes sent"""
+        self.send_response(response.status)
+        for name, value in response.headers:
+            self.send_header(name, value)
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        if head:
+            if response.file_path:
+                print(f"🎨 HEAD {response.label}: size={response.file_size}")
+            return 0
+        if response.file_path:
+            return self.send_file_body(response)
+        self.wfile.write(response.body)
+        return len(response.body)
     
-    def serve_metadata_head(self):
-        """Handle HEAD request for metadata"""
+    def send_file_body(self, response):
+        """Stream file efficiently with timeout protection"""
+        if USE_SENDFILE:
+            return self.sendfile_body(response)
+        bytes_sent = 0
         try:
-            metadata_path = os.path.join(DIRECTORY, 'Adafruit/current_metadata.json')
-            
-            if os.path.exists(metadata_path):
-                file_size = os.path.getsize(metadata_path)
-                mod_time = os.path.getmtime(metadata_path)
-                last_modified = datetime.fromtimestamp(mod_time).strftime('%a, %d %b %Y %H:%M:%S GMT')
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Content-Length', str(file_size))
-                self.send_header('Last-Modified', last_modified)
-                self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.send_header('Connection', 'close')
-                self.end_headers()
-            else:
-                # Default metadata size
-                default_size = len('{"title":"No music playing","artist":"","album":"","last_updated":0}')
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Content-Length', str(default_size))
-                self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.send_header('Connection', 'close')
-                self.end_headers()
-                
-        except Exception as e:
-            print(f"Error serving metadata HEAD: {e}")
-            self.send_error(500, "Internal server error")
-    
-    def serve_file_head(self, filepath, content_type):
-        """Handle HEAD request for files - crucial for artwork change detection"""
+            for chunk in response.file_chunks():
+                try:
+                    self.wfile.write(chunk)
+                    bytes_sent += len(chunk)
+                    # Flush periodically to prevent memory buildup
+                    if bytes_sent % (CHUNK_SIZE * 10) == 0:
+                        self.wfile.flush()
+                except BrokenPipeError:
+                    print(f"Client disconnected during {response.label} transfer")
+                    break
+                except Exception as e:
+                    print(f"Error during {response.label} transfer: {e}")
+                    break
+        except OSError as e:
+            print(f"❌ Error serving {response.label}: {e}")
+        print(f"✅ Served {response.label}: {bytes_sent}/{response.file_size} bytes")
+        return bytes_sent
+
+    def sendfile_body(self, response):
+        """Hand the file to the kernel with sendfile - no per-chunk Python reads or copies"""
+        bytes_sent = 0
         try:
-            full_path = os.path.join(DIRECTORY, filepath)
-            
-            if not os.path.exists(full_path):
-                self.send_error(404, f"File not found: {filepath}")
-                return
-            
-            file_size = os.path.getsize(full_path)
-            mod_time = os.path.getmtime(full_path)
-            last_modified = datetime.fromtimestamp(mod_time).strftime('%a, %d %b %Y %H:%M:%S GMT')
-            
-            print(f"🎨 HEAD {filepath}: size={file_size}, last_modified={last_modified}")
-            
-            # Send headers only (no body for HEAD)
-            self.send_response(200)
-            self.send_header('Content-Type', content_type)
-            self.send_header('Content-Length', str(file_size))
-            self.send_header('Last-Modified', last_modified)  # CRITICAL: This was missing!
-            self.send_header('Content-Disposition', f'inline; filename="{os.path.basename(filepath)}"')
-            self.send_header('Accept-Ranges', 'bytes')
-            self.send_header('Cache-Control', 'public, max-age=5')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Connection', 'close')
-            self.end_headers()
-            
-        except Exception as e:
-            print(f"❌ Error serving HEAD {filepath}: {e}")
-            self.send_error(500, "Internal server error")
+            with open(response.file_path, 'rb') as f:
+                # socket.sendfile falls back to buffered send() where os.sendfile can't be used
+                bytes_sent = self.connection.sendfile(f, response.file_offset, response.file_size)
+        except (BrokenPipeError, ConnectionResetError):
+            print(f"Client disconnected during {response.label} transfer")
+        except OSError as e:
+            print(f"❌ Error serving {response.label}: {e}")
+        print(f"✅ Served {response.label}: {bytes_sent}/{response.file_size} bytes (sendfile)")
+        return bytes_sent
 
 class ThreadedTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
     """TCP Server with threading support and resource limits"""
@@ -283,8 +802,174 @@ class ThreadedTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
         active_threads = threading.active_count()
         if active_threads > MAX_THREADS:
             print(f"⚠️ Too many active threads ({active_threads}), rejecting connection from {client_address}")
+            server_metrics.count('rejected')
+            return False
+        return True
+
+class RequestRejected(Exception):
+    """A request that can't be parsed - answered with status, then the connection is closed"""
+    status = 400
+    reason = "Bad request"
+
+class RequestHeadersTooLarge(RequestRejected):
+    """Too many header lines, or a line longer than MAX_HEADER_LINE - answered with 431"""
+    status = 431
+    reason = "Request header fields too large"
+
+class MalformedRequestLine(RequestRejected):
+    """A request line that isn't "METHOD path HTTP/x.y" - answered with 400, like the threaded mode"""
+
+class AsyncArtworkServer:
+    """Single event loop HTTP/1.1 server with keep-alive, idle timeouts and a connection limit"""
+    
+    def __init__(self, max_connections=MAX_CONNECTIONS, idle_timeout=KEEPALIVE_IDLE_TIMEOUT):
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.connections = 0
+    
+    def log(self, peer, request_line, status, size):
+        timestamp = datetime.now().strftime('%H:%M:%S')
+        print(f"[{timestamp}] [async {peer[0]}] \"{request_line}\" {status} {size}")
+    
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port,
+                                            backlog=MAX_CONNECTIONS, reuse_address=True)
+        async with server:
+            await server.serve_forever()
+    
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until the client closes it, asks to, or goes idle"""
+        peer = writer.get_extra_info('peername') or ('?', 0)
+        if self.connections >= self.max_connections:
+            print(f"⚠️ Too many connections ({self.connections}), rejecting {peer}")
+            server_metrics.count('rejected')
+            try:
+                await self.send(writer, error_response(503, "Too many connections"), False, False)
+            except (ConnectionError, OSError):
+                pass  # Client already gone
+            finally:
+                writer.close()
+            return
+        
+        self.connections += 1
+        server_metrics.count('connections')
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except RequestRejected as e:
+                    print(f"⚠️ {e.reason} from {peer}: {e}")
+                    size = await self.send(writer, error_response(e.status, e.reason), False, False)
+                    server_metrics.observe('', '', e.status, 0.0, size)  # Counted as endpoint/method "other"
+                    break
+                if request is None:
+                    break
+                method, path, version, headers = request
+                
+                # HTTP/1.1 defaults to keep-alive, HTTP/1.0 only when asked for
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+                
+                # A request body must be consumed, or its bytes would be read as the next request line
+                if not await self.discard_body(reader, headers):
+                    keep_alive = False
+                
+                start_time = time.perf_counter()
+                wait = wait_params(path) if method == 'GET' else None
+                if wait:
+                    await change_notifier.wait_async(*wait)
+                response = build_response(method, path, headers,
+                                          f"Open connections: {self.connections}/{self.max_connections}")
+                size = await self.send(writer, response, method == 'HEAD', keep_alive)
+                server_metrics.observe(path, method, response.status, time.perf_counter() - start_time, size)
+                self.log(peer, f"{method} {path} {version}", response.status,
+                         response.file_size if response.file_path else len(response.body))
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client went away mid-request
+        except asyncio.TimeoutError:
+            print(f"⏱️ Request from {peer} timed out after {REQUEST_TIMEOUT}s")
+        except Exception as e:
+            print(f"❌ Connection error from {peer}: {e}")
+        finally:
+            self.connections -= 1
+            server_metrics.count('connections', -1)
+            writer.close()
+    
+    async def read_request(self, reader):
+        """Read a request line and headers - None when the connection is closed or idle"""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            return None  # Idle keep-alive connection
+        except ValueError:
+            raise RequestHeadersTooLarge("request line over the stream limit")
+        if not request_line:
+            return None
+        if len(request_line) > MAX_HEADER_LINE:
+            raise RequestHeadersTooLarge(f"{len(request_line)}-byte request line")
+        parts = request_line.decode('latin-1').split()
+        if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+            raise MalformedRequestLine(repr(request_line[:80]))
+        method, path, version = parts
+        
+        headers = {}
+        for _ in range(MAX_REQUEST_HEADERS):
+            try:
+                line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+            except ValueError:
+                raise RequestHeadersTooLarge("header line over the stream limit")
+            if len(line) > MAX_HEADER_LINE:
+                raise RequestHeadersTooLarge(f"{len(line)}-byte header line")
+            if line in (b'\r\n', b'\n', b''):
+                return method, path, version, headers
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        raise RequestHeadersTooLarge(f"more than {MAX_REQUEST_HEADERS} header lines")
+    
+    async def discard_body(self, reader, headers):
+        """Read and drop a Content-Length request body - False when the connection must close instead"""
+        if 'transfer-encoding' in headers:
+            return False  # Chunked bodies aren't parsed
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            return False
+        if length < 0 or length > MAX_REQUEST_BODY:
             return False
+        if length:
+            await asyncio.wait_for(reader.readexactly(length), REQUEST_TIMEOUT)
         return True
+    
+    async def send(self, writer, response, head, keep_alive):
+        """Write status line, headers and body (files in CHUNK_SIZE pieces) - returns body bytes sent"""
+        lines = [f"HTTP/1.1 {response.status} {HTTPStatus(response.status).phrase}"]
+        lines += [f"{name}: {value}" for name, value in response.headers]
+        if keep_alive:
+            lines.append('Connection: keep-alive')
+            lines.append(f'Keep-Alive: timeout={self.idle_timeout}')
+        else:
+            lines.append('Connection: close')
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        
+        size = 0
+        if not head:
+            if response.file_path and USE_SENDFILE:
+                await writer.drain()  # Headers first - sendfile writes to the socket directly
+                with open(response.file_path, 'rb') as f:
+                    size = await asyncio.get_running_loop().sendfile(writer.transport, f, response.file_offset,
+                                                                     response.file_size, fallback=True)
+            elif response.file_path:
+                for chunk in response.file_chunks():
+                    writer.write(chunk)
+                    size += len(chunk)
+                    await writer.drain()
+            else:
+                writer.write(response.body)
+                size = len(response.body)
+        await writer.drain()
+        return size
 
 def signal_handler(signum, frame):
     """Handle shutdown signals"""
@@ -297,25 +982,42 @@ def main():
     signal.signal(signal.SIGTERM, signal_handler)
     
     os.chdir(DIRECTORY)
+    response_cache.start()
     
     print(f"🚀 Starting Fixed Sonos Display Server")
     print(f"📁 Directory: {DIRECTORY}")
     print(f"🌐 Port: {PORT}")
     print(f"🔧 Fixed: Proper HTTP headers for downloads")
-    print(f"🛡️ Resource Limits: Max {MAX_THREADS} threads, {MAX_CONNECTIONS} connections")
-    print(f"⏱️ Request timeout: {REQUEST_TIMEOUT}s, Chunk size: 4KB")
+    if SERVER_MODE == "asyncio":
+        print(f"🛡️ Resource Limits: Max {MAX_CONNECTIONS} connections, keep-alive idle timeout {KEEPALIVE_IDLE_TIMEOUT}s")
+    else:
+        print(f"🛡️ Resource Limits: Max {MAX_THREADS} threads, {MAX_CONNECTIONS} connections")
+    print(f"⏱️ Request timeout: {REQUEST_TIMEOUT}s, Chunk size: {CHUNK_SIZE // 1024}KB, sendfile: {'on' if USE_SENDFILE else 'off'}")
     print(f"📋 Endpoints:")
     print(f"   • http://localhost:{PORT}/metadata.json")
     print(f"   • http://localhost:{PORT}/Adafruit/artwork_bar.bmp")
+    print(f"   • http://localhost:{PORT}/Adafruit/artwork_bar_rle.bmp (RLE8)")
+    print(f"   • http://localhost:{PORT}/Adafruit/artwork_rle.bmp (RLE8)")
+    print(f"   • http://localhost:{PORT}/Adafruit/artwork_bar.jpg (baseline JPEG)")
+    print(f"   • http://localhost:{PORT}/Adafruit/artwork.jpg (baseline JPEG)")
+    print(f"   • http://localhost:{PORT}/state (version, track, artwork hashes)")
+    print(f"   • http://localhost:{PORT}/wait?since=<version> (long-poll /state)")
+    print(f"   • http://localhost:{PORT}/metrics (Prometheus)")
     print(f"   • http://localhost:{PORT}/status")
     print("")
     
     try:
-        with ThreadedTCPServer(("", PORT), FixedSonosHandler) as httpd:
-            print(f"✅ Server started at http://localhost:{PORT}")
-            print("🔄 Threading enabled, proper headers fixed")
+        if SERVER_MODE == "asyncio":
+            print(f"✅ Server starting at http://localhost:{PORT}")
+            print("🔄 asyncio event loop, HTTP/1.1 keep-alive")
             print("Press Ctrl+C to stop")
-            httpd.serve_forever()
+            asyncio.run(AsyncArtworkServer().serve("", PORT))
+        else:
+            with ThreadedTCPServer(("", PORT), FixedSonosHandler) as httpd:
+                print(f"✅ Server started at http://localhost:{PORT}")
+                print("🔄 Threading enabled, proper headers fixed")
+                print("Press Ctrl+C to stop")
+                httpd.serve_forever()
     except OSError as e:
         if e.errno == 98:
             print(f"❌ Port {PORT} already in use!")
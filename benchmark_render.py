@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Benchmark the artwork render pipeline of get_metadata_soco.py
+
+Run from the sonos-display directory (needs config.py and the Adafruit/ folder):
+    python3 benchmark_render.py [artwork image] [iterations]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+from PIL import Image
+
+import get_metadata_soco as sonos
+
+TRACKS = [
+    ("Hey Jude", "The Beatles", "1 (Remastered)"),
+    ("Bohemian Rhapsody", "Queen", "A Night at the Opera (2011 Remaster)"),
+    ("Alright", "Kendrick Lamar", "To Pimp a Butterfly"),
+    ("Everything In Its Right Place", "Radiohead", "Kid A"),
+]
+
+def timed(func, iterations):
+    """Run func iterations times and return the mean wall time in ms"""
+    func()  # Warm up (imports, first font load, caches)
+    start_time = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    return (time.perf_counter() - start_time) * 1000 / iterations
+
+def assemble_landscape_bar(landscape_tile, panel):
+    """The previous bar assembly: 960x320 landscape composite, then a full-frame rotate"""
+    composite = Image.new('P', (sonos.BAR_WIDTH, sonos.BAR_HEIGHT), sonos.BAR_ARTWORK_COLORS)
+    composite.paste(landscape_tile, (0, 0))
+    composite.paste(panel.point(lambda index: index + sonos.BAR_ARTWORK_COLORS), (sonos.BAR_ARTWORK_SIZE, 0))
+    return composite.rotate(-90, expand=True)
+
+def assemble_portrait_bar(portrait_tile, panel):
+    """The current bar assembly: pre-rotated tile, only the text panel rotated"""
+    composite = Image.new('P', (sonos.BAR_HEIGHT, sonos.BAR_WIDTH), sonos.BAR_ARTWORK_COLORS)
+    composite.paste(portrait_tile, (0, 0))
+    panel = panel.point(lambda index: index + sonos.BAR_ARTWORK_COLORS).transpose(Image.ROTATE_270)
+    composite.paste(panel, (0, sonos.BAR_ARTWORK_SIZE))
+    return composite
+
+def check_decode_modes():
+    """decode_artwork must take every image mode a cover server may send, at any size"""
+    from io import BytesIO
+    gradient = Image.linear_gradient("L").resize((1440, 1440))
+    samples = {
+        "PNG RGB": ("PNG", gradient.convert("RGB")),
+        "PNG palette": ("PNG", gradient.convert("RGB").quantize(64)),
+        "PNG 1-bit": ("PNG", gradient.convert("1")),
+        "PNG I;16": ("PNG", gradient.convert("I;16")),
+        "PNG RGBA": ("PNG", gradient.convert("RGBA")),
+        "GIF": ("GIF", gradient.convert("RGB").quantize(64)),
+    }
+    stdout = sys.stdout
+    failures = 0
+    for label, (image_format, image) in samples.items():
+        data = BytesIO()
+        image.save(data, image_format)
+        sys.stdout = open(os.devnull, "w")
+        try:
+            decoded = sonos.decode_artwork(data.getvalue(), 720)
+            ok = decoded.mode == "RGB" and min(decoded.size) >= 720
+        except Exception:
+            ok = False
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        if not ok:
+            print(f"✗ decode_artwork failed on 1440x1440 {label}")
+            failures += 1
+    if not failures:
+        print(f"✓ decode_artwork handles {len(samples)} image modes at 1440x1440")
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else sonos.BMP_PATH
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    work_dir = tempfile.mkdtemp(prefix="render_bench_")
+    square_path = os.path.join(work_dir, "artwork.bmp")
+    bar_path = os.path.join(work_dir, "artwork_bar.bmp")
+    shutil.copyfile(source, square_path)
+
+    print(f"Source: {source}, {iterations} iterations")
+    check_decode_modes()
+
+    def text_panel(i=0):
+        sonos.render_bar_text_panel(*TRACKS[i % len(TRACKS)])
+
+    def bar_same_album(i=0):
+        title, artist, album = TRACKS[i % len(TRACKS)]
+        sonos.create_bar_artwork(square_path, bar_path, title, artist, album, art_key="bench")
+
+    def bar_new_album(i=0):
+        title, artist, album = TRACKS[i % len(TRACKS)]
+        sonos.create_bar_artwork(square_path, bar_path, title, artist, album, art_key=f"bench-{time.time()}")
+
+    # The pipeline prints progress for every render - keep the report readable
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:
+        results = []
+        for label, func in (
+            ("Text panel render", text_panel),
+            ("Bar composite (same album)", bar_same_album),
+            ("Bar composite (new album)", bar_new_album),
+        ):
+            sys.stdout = devnull
+            try:
+                elapsed_ms = timed(func, iterations)
+            finally:
+                sys.stdout = stdout
+            results.append((label, elapsed_ms))
+
+    # Frame assembly only (tile and panel prepared), and a pixel check of both layouts
+    sys.stdout = open(os.devnull, "w")
+    try:
+        portrait_tile = sonos.load_bar_artwork_tile(square_path)
+        panels = [sonos.render_bar_text_panel(*track) for track in TRACKS]
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    landscape_tile = portrait_tile.transpose(Image.ROTATE_90)
+    for panel in panels:
+        if assemble_landscape_bar(landscape_tile, panel).tobytes() != assemble_portrait_bar(portrait_tile, panel).tobytes():
+            print("✗ Portrait bar assembly differs from the landscape + rotate result")
+            break
+    else:
+        print(f"✓ Portrait bar assembly is pixel-identical for {len(panels)} tracks")
+    results.append(("Bar assembly: landscape + rotate", timed(lambda i=0: assemble_landscape_bar(landscape_tile, panels[i % len(panels)]), iterations * 10)))
+    results.append(("Bar assembly: native portrait", timed(lambda i=0: assemble_portrait_bar(portrait_tile, panels[i % len(panels)]), iterations * 10)))
+
+    for label, elapsed_ms in results:
+        print(f"{label:<40} {elapsed_ms:8.2f} ms")
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
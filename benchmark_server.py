@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Benchmark artwork file serving in artwork_server.py: server CPU per request with and without sendfile
+
+Run from the sonos-display directory (needs the Adafruit/ artwork files), on Linux:
+    python3 benchmark_server.py [requests] [artwork URL path]
+"""
+
+import os
+import sys
+import time
+import socket
+import subprocess
+import http.client
+
+PORT = 8123
+TICKS_PER_SECOND = os.sysconf('SC_CLK_TCK')
+
+# Server started in a child process so its CPU time can be read from /proc on its own.
+# The response cache is disabled so every request goes down the file path being measured.
+SERVER_SCRIPT = """
+import os, sys
+sys.path.insert(0, sys.argv[4])
+import artwork_server
+artwork_server.DIRECTORY = os.getcwd()
+artwork_server.PORT = int(sys.argv[1])
+artwork_server.SERVER_MODE = sys.argv[2]
+artwork_server.USE_SENDFILE = sys.argv[3] == "on"
+artwork_server.RESPONSE_CACHE_MAX_FILE_BYTES = 0
+artwork_server.main()
+"""
+
+def process_cpu_seconds(pid):
+    """User + system CPU time of a process, from /proc/<pid>/stat"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / TICKS_PER_SECOND  # utime, stime
+
+def wait_for_port(port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server did not start on port {port}")
+
+def fetch_all(path, requests):
+    """GET path requests times, reusing the connection while the server keeps it open"""
+    connection = None
+    total_bytes = 0
+    for _ in range(requests):
+        if connection is None:
+            connection = http.client.HTTPConnection("127.0.0.1", PORT, timeout=30)
+        connection.request("GET", path)
+        response = connection.getresponse()
+        total_bytes += len(response.read())
+        if response.status != 200:
+            raise RuntimeError(f"GET {path} returned {response.status}")
+        if response.will_close:
+            connection.close()
+            connection = None
+    if connection:
+        connection.close()
+    return total_bytes
+
+def run(mode, sendfile, path, requests):
+    """(server CPU ms per request, wall ms per request, bytes per request) for one configuration"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    server = subprocess.Popen([sys.executable, "-c", SERVER_SCRIPT, str(PORT), mode, sendfile, script_dir],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(PORT)
+        fetch_all(path, 5)  # Warm up (imports, first open, page cache)
+        cpu_before = process_cpu_seconds(server.pid)
+        start_time = time.perf_counter()
+        total_bytes = fetch_all(path, requests)
+        elapsed = time.perf_counter() - start_time
+        cpu = process_cpu_seconds(server.pid) - cpu_before
+    finally:
+        server.terminate()
+        server.wait()
+    return cpu * 1000 / requests, elapsed * 1000 / requests, total_bytes // requests
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    path = sys.argv[2] if len(sys.argv) > 2 else "/Adafruit/artwork.bmp"
+
+    print(f"GET {path}, {requests} requests per configuration (response cache off)")
+    print(f"{'Mode':<10} {'sendfile':<9} {'server CPU':>14} {'wall time':>12} {'bytes':>9}")
+    for mode in ("asyncio", "threaded"):
+        for sendfile in ("off", "on"):
+            cpu_ms, wall_ms, size = run(mode, sendfile, path, requests)
+            print(f"{mode:<10} {sendfile:<9} {cpu_ms:11.3f} ms {wall_ms:9.3f} ms {size:>9}")
+
+if __name__ == "__main__":
+    main()
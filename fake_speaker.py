@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""Fake Sonos speaker for checking TrackEventListener in get_metadata_soco.py without real hardware
+
+Serves a device description stub, the household and zone group calls SoCo makes before subscribing
+and GENA SUBSCRIBE/UNSUBSCRIBE on port 1400, then sends AVTransport/RenderingControl NOTIFY events
+to the subscribed callbacks. Running it checks TrackEventListener end to end: event_queue wake-ups
+and the auto_renew_fail path when the speaker stops accepting renewals.
+Run from the sonos-display directory (needs config.py), with nothing else on port 1400 of that IP:
+    python3 fake_speaker.py [speaker IP, default 127.0.0.1]
+SoCo logs each failed renewal with a traceback - those are the failures being checked.
+"""
+
+import sys
+import time
+import itertools
+import threading
+import http.server
+import urllib.request
+from xml.sax.saxutils import escape
+
+import soco
+
+SPEAKER_PORT = 1400  # SoCo always talks to speakers on this port
+LISTENER_PORT = 1401  # SoCo's event listener, moved off the fake speaker's port
+SPEAKER_UID = "RINCON_FAKE00000001400"
+SPEAKER_NAME = "Fake Speaker"
+GRANTED_TIMEOUT = 10  # Seconds granted per subscription - SoCo renews at 85%, so failures show quickly
+
+DEVICE_DESCRIPTION = f"""<?xml version="1.0" encoding="utf-8"?>
+<root xmlns="urn:schemas-upnp-org:device-1-0">
+  <specVersion><major>1</major><minor>0</minor></specVersion>
+  <device>
+    <deviceType>urn:schemas-upnp-org:device:ZonePlayer:1</deviceType>
+    <friendlyName>{SPEAKER_NAME}</friendlyName>
+    <manufacturer>Sonos, Inc.</manufacturer>
+    <modelName>Fake</modelName>
+    <roomName>{SPEAKER_NAME}</roomName>
+    <UDN>uuid:{SPEAKER_UID}</UDN>
+    <serviceList>
+      <service>
+        <serviceType>urn:schemas-upnp-org:service:AVTransport:1</serviceType>
+        <serviceId>urn:upnp-org:serviceId:AVTransport</serviceId>
+        <controlURL>/MediaRenderer/AVTransport/Control</controlURL>
+        <eventSubURL>/MediaRenderer/AVTransport/Event</eventSubURL>
+      </service>
+      <service>
+        <serviceType>urn:schemas-upnp-org:service:RenderingControl:1</serviceType>
+        <serviceId>urn:upnp-org:serviceId:RenderingControl</serviceId>
+        <controlURL>/MediaRenderer/RenderingControl/Control</controlURL>
+        <eventSubURL>/MediaRenderer/RenderingControl/Event</eventSubURL>
+      </service>
+    </serviceList>
+  </device>
+</root>
+"""
+
+# The only control calls SoCo makes while subscribing: service -> action -> its single out argument
+ACTIONS = {
+    "DeviceProperties": {"GetHouseholdID": "CurrentHouseholdID"},
+    "ZoneGroupTopology": {"GetZoneGroupState": "ZoneGroupState"},
+}
+HOUSEHOLD_ID = "Sonos_FakeHousehold"
+
+SCPD_ACTION = ("<action><name>{action}</name><argumentList><argument><name>{argument}</name>"
+               "<direction>out</direction><relatedStateVariable>{argument}</relatedStateVariable>"
+               "</argument></argumentList></action>")
+SCPD_VARIABLE = '<stateVariable sendEvents="no"><name>{argument}</name><dataType>string</dataType></stateVariable>'
+
+def service_description(actions):
+    """Minimal SCPD listing the faked actions - SoCo reads it before composing a SOAP call"""
+    return ('<?xml version="1.0"?><scpd xmlns="urn:schemas-upnp-org:service-1-0"><actionList>'
+            + "".join(SCPD_ACTION.format(action=action, argument=argument) for action, argument in actions.items())
+            + "</actionList><serviceStateTable>"
+            + "".join(SCPD_VARIABLE.format(argument=argument) for argument in actions.values())
+            + "</serviceStateTable></scpd>")
+
+SOAP_RESPONSE = """<?xml version="1.0"?>
+<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" s:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/">
+<s:Body><u:{action}Response xmlns:u="{service_type}">{arguments}</u:{action}Response></s:Body>
+</s:Envelope>"""
+
+LAST_CHANGE = {
+    "AVTransport": ('<Event xmlns="urn:schemas-upnp-org:metadata-1-0/AVT/"><InstanceID val="0">'
+                    '<TransportState val="{state}"/><CurrentTrackURI val="x-fake:{track}"/>'
+                    '</InstanceID></Event>'),
+    "RenderingControl": ('<Event xmlns="urn:schemas-upnp-org:metadata-1-0/RCS/"><InstanceID val="0">'
+                         '<Volume channel="Master" val="{volume}"/></InstanceID></Event>'),
+}
+
+class FakeSpeaker(http.server.ThreadingHTTPServer):
+    """One fake ZonePlayer - tracks GENA subscriptions and sends their NOTIFY events"""
+
+    daemon_threads = True
+
+    def __init__(self, ip="127.0.0.1"):
+        super().__init__((ip, SPEAKER_PORT), FakeSpeakerHandler)
+        self.ip = ip
+        self.subscriptions = {}  # SID -> {"service", "callback", "seq"}
+        self.sids = (f"uuid:{SPEAKER_UID}_sub{number:010d}" for number in itertools.count(1))
+        self.renewals_allowed = True
+        self.offline = False  # Drop SUBSCRIBE connections without answering, like a powered-off speaker
+        self.renewals = 0  # Renewals accepted
+        self.lock = threading.Lock()
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def zone_group_state(self):
+        """One group with this speaker as its only member"""
+        location = f"http://{self.ip}:{SPEAKER_PORT}/xml/device_description.xml"
+        return (f'<ZoneGroupState><ZoneGroups><ZoneGroup Coordinator="{SPEAKER_UID}" ID="{SPEAKER_UID}:1">'
+                f'<ZoneGroupMember UUID="{SPEAKER_UID}" Location="{location}" ZoneName="{SPEAKER_NAME}"/>'
+                f'</ZoneGroup></ZoneGroups><VanishedDevices/></ZoneGroupState>')
+
+    def action_result(self, action):
+        if action == "GetHouseholdID":
+            return HOUSEHOLD_ID
+        return self.zone_group_state()
+
+    def subscribe(self, service, callback):
+        with self.lock:
+            sid = next(self.sids)
+            self.subscriptions[sid] = {"service": service, "callback": callback, "seq": 0}
+        return sid
+
+    def renew(self, sid):
+        """False when the SID is unknown or renewals are being refused"""
+        with self.lock:
+            if not (self.renewals_allowed and sid in self.subscriptions):
+                return False
+            self.renewals += 1
+            return True
+
+    def unsubscribe(self, sid):
+        with self.lock:
+            return self.subscriptions.pop(sid, None) is not None
+
+    def expire_subscriptions(self):
+        """Forget every SID and refuse renewals, as a rebooted speaker would"""
+        with self.lock:
+            self.subscriptions.clear()
+            self.renewals_allowed = False
+
+    def notify(self, service, **values):
+        """Send a LastChange event to every subscriber of service - returns the number delivered
+
+        Subscribers whose callback refuses the NOTIFY are dropped, as a real speaker does with
+        subscriptions whose UNSUBSCRIBE it never received.
+        """
+        with self.lock:
+            targets = [(sid, sub) for sid, sub in self.subscriptions.items() if sub["service"] == service]
+            for _, subscription in targets:
+                subscription["seq"] += 1
+        last_change = LAST_CHANGE[service].format(**values)
+        body = ('<e:propertyset xmlns:e="urn:schemas-upnp-org:event-1-0"><e:property>'
+                f'<LastChange>{escape(last_change)}</LastChange></e:property></e:propertyset>')
+        delivered = 0
+        for sid, subscription in targets:
+            request = urllib.request.Request(subscription["callback"], data=body.encode("utf-8"), method="NOTIFY", headers={
+                "Content-Type": 'text/xml; charset="utf-8"',
+                "NT": "upnp:event",
+                "NTS": "upnp:propchange",
+                "SID": sid,
+                "SEQ": str(subscription["seq"] - 1),
+            })
+            try:
+                urllib.request.urlopen(request, timeout=5).read()
+                delivered += 1
+            except OSError:
+                self.unsubscribe(sid)
+        return delivered
+
+class FakeSpeakerHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def send_empty(self, status, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def send_xml(self, body):
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", 'text/xml; charset="utf-8"')
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        service = self.path[len("/xml/"):-len("1.xml")]
+        if self.path == "/xml/device_description.xml":
+            self.send_xml(DEVICE_DESCRIPTION)
+        elif self.path.startswith("/xml/") and service in ACTIONS:
+            self.send_xml(service_description(ACTIONS[service]))
+        else:
+            self.send_empty(404)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        service_type, _, action = self.headers.get("SOAPACTION", "").strip('"').partition("#")
+        argument = next((actions[action] for actions in ACTIONS.values() if action in actions), None)
+        if argument:
+            arguments = f"<{argument}>{escape(self.server.action_result(action))}</{argument}>"
+            self.send_xml(SOAP_RESPONSE.format(action=action, service_type=service_type, arguments=arguments))
+        else:
+            self.send_empty(500)  # Playback control is not faked
+
+    def do_SUBSCRIBE(self):
+        if self.server.offline:
+            self.close_connection = True
+            return
+        timeout = ("TIMEOUT", f"Second-{GRANTED_TIMEOUT}")
+        sid = self.headers.get("SID")
+        if sid:
+            if self.server.renew(sid):
+                self.send_empty(200, [("SID", sid), timeout])
+            else:
+                self.send_empty(412)  # Precondition Failed - the subscription is gone
+            return
+        callback = self.headers.get("CALLBACK", "").strip("<>")
+        if not callback or self.headers.get("NT") != "upnp:event":
+            self.send_empty(412)
+            return
+        service = self.path.split("/")[-2]  # /MediaRenderer/<service>/Event
+        self.send_empty(200, [("SID", self.server.subscribe(service, callback)), timeout])
+
+    def do_UNSUBSCRIBE(self):
+        if self.server.offline:
+            self.close_connection = True
+            return
+        self.send_empty(200 if self.server.unsubscribe(self.headers.get("SID", "")) else 412)
+
+    def log_message(self, format, *args):
+        pass
+
+def check(name, passed):
+    print(f"{'✓' if passed else '✗'} {name}")
+    return passed
+
+def check_resubscribe(sonos, speaker, fake, failed_listener, track):
+    """ensure_event_listener() replaces a failed listener with one that receives events"""
+    sonos.ensure_event_listener(speaker)
+    listener = sonos.event_listener
+    results = [check("ensure_event_listener() resubscribes",
+                     listener is not failed_listener and listener is not None and listener.is_healthy())]
+    if listener is not None:
+        fake.notify("AVTransport", state="PLAYING", track=track)
+        results.append(check("New subscription delivers events", listener.wait(5)))
+    return results
+
+def main():
+    ip = sys.argv[1] if len(sys.argv) > 1 else "127.0.0.1"
+    soco.config.EVENT_LISTENER_PORT = LISTENER_PORT
+    import get_metadata_soco as sonos
+
+    fake = FakeSpeaker(ip).start()
+    speaker = soco.SoCo(ip)
+    results = []
+
+    sonos.ensure_event_listener(speaker)
+    listener = sonos.event_listener
+    results.append(check("Subscribed to AVTransport and RenderingControl",
+                         listener is not None and listener.is_healthy() and len(fake.subscriptions) == 2))
+    if listener is None:
+        sys.exit(1)
+
+    results.append(check("wait() times out without events", listener.wait(0.5) is False))
+
+    fake.notify("RenderingControl", volume=30)
+    results.append(check("RenderingControl event does not wake the loop", listener.wait(1) is False))
+
+    for track in range(3):
+        fake.notify("AVTransport", state="PLAYING", track=track)
+    start_time = time.monotonic()
+    woken = listener.wait(5)
+    results.append(check(f"AVTransport event wakes the loop ({(time.monotonic() - start_time) * 1000:.0f} ms)", woken))
+    results.append(check("A burst of events is collapsed into one wake-up", listener.wait(0.5) is False))
+
+    time.sleep(GRANTED_TIMEOUT)  # At least one successful renewal
+    results.append(check(f"Subscriptions survive renewal ({fake.renewals} accepted)", fake.renewals and listener.is_healthy()))
+
+    # Unreachable speaker: the renewal request itself fails, so auto_renew_fail fires at once
+    fake.offline = True
+    results.append(check("Unreachable speaker: failed renewal wakes the loop", listener.wait(GRANTED_TIMEOUT)))
+    results.append(check("Listener reports itself unhealthy", not listener.is_healthy()))
+    fake.offline = False
+    results.extend(check_resubscribe(sonos, speaker, fake, listener, track=3))
+
+    # Rebooted speaker: SoCo ignores the 412 to a renewal, so the failure only surfaces when the
+    # next renewal finds the subscription expired - up to 2 x 85% of EVENT_SUBSCRIPTION_TIMEOUT
+    # in production, during which the EVENT_SAFETY_POLL_INTERVAL poll keeps the display current
+    listener = sonos.event_listener
+    fake.expire_subscriptions()
+    results.append(check("Rebooted speaker: renewal after expiry wakes the loop", listener.wait(GRANTED_TIMEOUT * 2)))
+    results.append(check("Listener reports itself unhealthy", not listener.is_healthy()))
+    fake.renewals_allowed = True
+    results.extend(check_resubscribe(sonos, speaker, fake, listener, track=4))
+
+    sonos.event_listener.stop()
+    results.append(check("stop() unsubscribes", not fake.subscriptions))
+    soco.events.event_listener.stop()
+    fake.shutdown()
+    sys.exit(0 if all(results) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,16 @@ import os
 import random
 import shutil
 import json
+import hashlib
+import queue
 import re
+import sqlite3
+import threading
 import xml.etree.ElementTree as ET
 from io import BytesIO
+from functools import partial
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
 import time
 import psutil
 import subprocess
@@ -20,6 +27,10 @@ from config import SonosCredentials
 JPG_PATH = "Adafruit/artwork.jpg"
 BMP_PATH = "Adafruit/artwork.bmp"
 BMP_BAR_PATH = "Adafruit/artwork_bar.bmp"  # New 320x320 rotated image
+BMP_RLE_PATH = "Adafruit/artwork_rle.bmp"  # RLE8-compressed copy of artwork.bmp for the Qualia
+BMP_BAR_RLE_PATH = "Adafruit/artwork_bar_rle.bmp"  # RLE8-compressed copy of artwork_bar.bmp
+JPG_BAR_PATH = "Adafruit/artwork_bar.jpg"  # Baseline JPEG copy of artwork_bar.bmp for jpegio
+JPEG_QUALITY = 85  # Baseline JPEG renditions - jpegio on the Qualia decodes baseline only
 METADATA_JSON_PATH = "Adafruit/current_metadata.json"  # Current song metadata
 PLACEHOLDER_USAGE_FILE = "Adafruit/placeholder_usage.json"
 QUALIA_MOUNT_POINT = "/Volumes/CIRCUITPY"  # Mac mount point for CircuitPython
@@ -35,10 +46,60 @@ BLANK_SCREEN_FILE = "Adafruit/blank_screen.bmp"
 
 # Optimization constants
 NO_MUSIC_LOG_INTERVAL = 60  # Only log no-music status every 60 seconds
-METADATA_WRITE_INTERVAL = 5  # Only write metadata JSON every 5 seconds
+METADATA_WRITE_INTERVAL = 5  # Recheck an unchanged track at most every 5 seconds (written only if its content changed)
 NETWORK_RETRY_INTERVAL = 30  # Retry network operations every 30 seconds
 GC_INTERVAL = 100  # Run garbage collection every 100 iterations
 
+# Event-driven track change detection (SoCo UPnP subscriptions)
+USE_EVENT_SUBSCRIPTIONS = True  # React to AVTransport events instead of polling every second
+EVENT_SUBSCRIPTION_TIMEOUT = 600  # Requested subscription lifetime in seconds (auto-renewed)
+EVENT_SAFETY_POLL_INTERVAL = 30  # Slow safety-net poll while subscriptions are healthy
+POLL_INTERVAL = 1  # Fallback polling interval when events are unavailable
+
+# Speaker discovery cache
+TARGET_SPEAKER_NAME = "Home Office"  # Speaker whose playback drives the displays
+SPEAKER_CACHE_FILE = "Adafruit/speaker_cache.json"  # Last-known speaker IPs for fast startup
+TOPOLOGY_REFRESH_INTERVAL = 300  # Background topology refresh every 5 minutes
+DISCOVERY_TIMEOUT = 5  # SSDP discovery timeout in seconds
+
+# Sonos Control API client
+CONTROL_API_CACHE_TTL = 15  # Share one groups snapshot for 15 seconds
+CONTROL_API_TIMEOUT = 10  # Request timeout in seconds
+
+# Rendered artwork cache (finished square and bar BMPs)
+ARTWORK_CACHE_DIR = "Adafruit/cache"
+ARTWORK_CACHE_MAX_BYTES = 64 * 1024 * 1024  # ~75 tracks of square + bar renditions
+
+# Immutable, content-addressed copies of the served renditions (/art/<hash>.bmp on the artwork server)
+ART_DIR = "Adafruit/art"
+ART_URL_PREFIX = "/art/"
+ART_RETENTION = 600  # Unreferenced copies stay this many seconds for displays still downloading them
+
+# Persistent iTunes artwork lookup cache
+ITUNES_CACHE_DB = "Adafruit/itunes_cache.sqlite3"
+ITUNES_POSITIVE_TTL = 30 * 24 * 3600  # Found artwork is trusted for 30 days
+ITUNES_NEGATIVE_TTL = 24 * 3600  # "No match" is retried after a day
+ITUNES_TIMEOUT = (3, 5)  # Connect and read timeouts in seconds
+
+# Bar composite layout (960x320 landscape design, drawn directly into the 320x960 portrait frame)
+BAR_WIDTH = 960
+BAR_HEIGHT = 320
+BAR_ARTWORK_SIZE = 320  # Square artwork on left side
+BAR_BACKGROUND = (20, 20, 20)
+BAR_ARTWORK_COLORS = 48  # Palette share of the artwork tile
+BAR_TEXT_COLORS = 16  # Palette share of the text panel (64 colors total)
+BAR_FONT_CANDIDATES = [
+    "/System/Library/Fonts/Arial.ttf",  # macOS
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Raspberry Pi OS
+]
+BAR_TITLE_FONT_SIZE = 46
+BAR_ARTIST_FONT_SIZE = 36
+BAR_ALBUM_FONT_SIZE = 28
+BAR_TEXT_MARGIN = 20  # Left and right margin inside the text panel
+BAR_TEXT_WIDTH = BAR_WIDTH - BAR_ARTWORK_SIZE - 2 * BAR_TEXT_MARGIN  # Pixel width available per line
+BAR_TEXT_MAX_LINES = 2  # Lines per block (artist, title, album) before ellipsizing
+BAR_LAYOUT_CACHE_SIZE = 256  # Memoized line layouts (repeat artists and albums skip layout)
+
 # === Sonos API Credentials ===
 ACCESS_TOKEN = SonosCredentials.ACCESS_TOKEN
 HOUSEHOLD_ID = SonosCredentials.HOUSEHOLD_ID
@@ -52,14 +113,21 @@ last_music_detected = time.time()
 blank_screen_shown = False
 last_no_music_log = 0
 last_metadata_write = 0
+metadata_lock = threading.Lock()  # Detection loop and render worker both write the metadata JSON
+metadata_state = {"track": None, "artwork": {}, "artwork_track": None}  # What the metadata JSON advertises
+last_written_metadata = None  # Content of the last metadata JSON written, without last_updated
 iteration_count = 0
-last_network_error = 0
+event_listener = None  # TrackEventListener for the monitored speaker
 
 # Global metadata for bar artwork creation
 current_song_title = ""
 current_song_artist = ""
 current_song_album = ""
 
+# Album-level render reuse: artwork key of the square BMP on disk and its bar tile
+last_rendered_art_key = None
+bar_tile_cache = {"key": None, "tile": None}
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -104,6 +172,8 @@ def safe_write(func):
                 # Force garbage collection after file operations
                 gc.collect()
                 return result
+            except RenderJobSuperseded:
+                raise  # A newer song is waiting - retrying would only delay it
             except Exception as e:
                 if attempt < MAX_RETRIES - 1:
                     logger.warning(f"Attempt {attempt + 1} failed: {e}")
@@ -114,21 +184,63 @@ def safe_write(func):
                     raise
     return wrapper
 
-def get_playback_metadata_by_uid():
-    """Get metadata from Sonos Control API with error handling"""
-    global last_network_error
-    
-    # Don't retry too frequently on network errors
-    current_time = time.time()
-    if current_time - last_network_error < NETWORK_RETRY_INTERVAL:
-        logger.debug("Skipping network call due to recent error")
-        return {}
-    
-    try:
-        url = f"https://api.ws.sonos.com/control/api/v1/households/{HOUSEHOLD_ID}/groups"
-        response = requests.get(url, headers=HEADERS, timeout=10)  # Add timeout
-        response.raise_for_status()
-        data = response.json()
+class SonosControlClient:
+    """Sonos Control API client with a keep-alive session, shared TTL snapshot and 429 backoff"""
+
+    def __init__(self):
+        self.url = f"https://api.ws.sonos.com/control/api/v1/households/{HOUSEHOLD_ID}/groups"
+        self.session = requests.Session()  # Reuses the TLS connection between calls
+        self.session.headers.update(HEADERS)
+        self.lock = threading.Lock()
+        self.snapshot = {}
+        self.snapshot_time = 0
+        self.etag = None
+        self.blocked_until = 0
+        self.request_count = 0
+
+    def get_groups(self):
+        """Get uid -> playback metadata, shared by all callers for CONTROL_API_CACHE_TTL seconds"""
+        with self.lock:
+            current_time = time.time()
+            if current_time - self.snapshot_time < CONTROL_API_CACHE_TTL:
+                return self.snapshot
+
+            # Don't call again while rate limited or backing off after an error
+            if current_time < self.blocked_until:
+                logger.debug(f"Skipping Control API call for {self.blocked_until - current_time:.0f}s")
+                return {}
+
+            try:
+                headers = {"If-None-Match": self.etag} if self.etag else {}
+                response = self.session.get(self.url, headers=headers, timeout=CONTROL_API_TIMEOUT)
+                self.request_count += 1
+
+                if response.status_code == 429:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    self.blocked_until = current_time + retry_after
+                    logger.warning(f"Control API rate limited, retrying after {retry_after:.0f}s")
+                    return {}
+
+                if response.status_code == 304:
+                    self.snapshot_time = current_time
+                    return self.snapshot
+
+                response.raise_for_status()
+                self.snapshot = self._parse_groups(response.json())
+                self.snapshot_time = current_time
+                self.etag = response.headers.get("ETag")
+                return self.snapshot
+            except Exception as e:
+                self.blocked_until = current_time + NETWORK_RETRY_INTERVAL
+                logger.warning(f"Network error getting playback metadata: {e}")
+                return {}
+
+    def get_track(self, uid):
+        """Get Control API metadata for one player"""
+        return self.get_groups().get(uid, {})
+
+    @staticmethod
+    def _parse_groups(data):
         uid_map = {}
         for group in data.get("groups", []):
             metadata = group.get("playback", {}).get("playbackMetadata", {})
@@ -142,25 +254,397 @@ def get_playback_metadata_by_uid():
                     "service": metadata.get("serviceName"),
                 }
         return uid_map
-    except Exception as e:
-        last_network_error = current_time
-        logger.warning(f"Network error getting playback metadata: {e}")
-        return {}
+
+class LazyControlTrack:
+    """dict-like view of one player's Control API metadata, fetched on first .get()"""
+
+    def __init__(self, client, uid):
+        self.client = client
+        self.uid = uid
+        self.track = None
+
+    def get(self, key, default=None):
+        if self.track is None:
+            self.track = self.client.get_track(self.uid)
+        return self.track.get(key, default)
+
+    def peek(self):
+        """Return whatever has been fetched so far without making a request"""
+        return self.track or {}
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds to wait"""
+    if not value:
+        return NETWORK_RETRY_INTERVAL
+    try:
+        return max(0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_time = parsedate_to_datetime(value).timestamp()
+        return max(0, retry_time - time.time())
+    except (TypeError, ValueError):
+        return NETWORK_RETRY_INTERVAL
+
+class ItunesArtworkCache:
+    """Persistent (artist, track) -> iTunes artwork URL index with TTLs and single-flight lookups"""
+
+    def __init__(self, db_path=ITUNES_CACHE_DB):
+        self.db_path = db_path
+        self.db = None
+        self.entries = {}  # key -> (art_url or None, expires) - answers repeats from memory
+        self.in_flight = {}  # key -> threading.Event for lookups currently on the network
+        self.lock = threading.Lock()
+        self.session = requests.Session()
+
+    def _open(self):
+        """Open the SQLite index and load unexpired entries into memory"""
+        if self.db is not None:
+            return
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS itunes_artwork "
+            "(key TEXT PRIMARY KEY, art_url TEXT, expires REAL NOT NULL)"
+        )
+        self.db.execute("DELETE FROM itunes_artwork WHERE expires < ?", (time.time(),))
+        self.db.commit()
+        for key, art_url, expires in self.db.execute("SELECT key, art_url, expires FROM itunes_artwork"):
+            self.entries[key] = (art_url, expires)
+        logger.info(f"iTunes lookup cache: {len(self.entries)} entries")
+
+    @staticmethod
+    def normalize_key(artist, track):
+        """Case and whitespace insensitive key so minor metadata differences share an entry"""
+        artist = " ".join(clean_metadata_value(artist).casefold().split())
+        track = " ".join(clean_metadata_value(track).casefold().split())
+        return f"{artist}\x1f{track}"
+
+    def _cached(self, key):
+        entry = self.entries.get(key)
+        if entry and entry[1] > time.time():
+            return True, entry[0]
+        return False, None
+
+    def _store(self, key, art_url):
+        ttl = ITUNES_POSITIVE_TTL if art_url else ITUNES_NEGATIVE_TTL
+        expires = time.time() + ttl
+        self.entries[key] = (art_url, expires)
+        try:
+            self.db.execute(
+                "INSERT OR REPLACE INTO itunes_artwork (key, art_url, expires) VALUES (?, ?, ?)",
+                (key, art_url, expires)
+            )
+            self.db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Error saving iTunes lookup cache: {e}")
+
+    def _fetch(self, artist, track):
+        """Query the iTunes search API"""
+        query = f"{track} {artist}"
+        response = self.session.get(
+            "https://itunes.apple.com/search",
+            params={"term": query, "media": "music", "limit": 1},
+            timeout=ITUNES_TIMEOUT,
+        )
+        response.raise_for_status()
+        results = response.json().get("results", [])
+        if results:
+            art_url = results[0].get("artworkUrl100")
+            if art_url:
+                # Ask for the display size - Apple scales server-side, no 1200px decode here
+                return art_url.replace("100x100bb", "720x720bb")
+        return None
+
+    def lookup(self, artist, track):
+        """Get the artwork URL, hitting the network at most once per key per TTL"""
+        key = self.normalize_key(artist, track)
+        with self.lock:
+            self._open()
+            found, art_url = self._cached(key)
+            if found:
+                logger.debug(f"iTunes lookup cache hit: {artist} - {track}")
+                return art_url
+            waiter = self.in_flight.get(key)
+            if waiter is None:
+                self.in_flight[key] = threading.Event()
+
+        # Another thread is already looking this key up - share its result
+        if waiter is not None:
+            waiter.wait(sum(ITUNES_TIMEOUT))
+            with self.lock:
+                return self._cached(key)[1]
+
+        art_url = None
+        try:
+            art_url = self._fetch(artist, track)
+            with self.lock:
+                self._store(key, art_url)
+        except Exception as e:
+            # Network errors are not cached - the next song change can retry
+            logger.warning(f"iTunes lookup failed: {e}")
+        finally:
+            with self.lock:
+                self.in_flight.pop(key).set()
+        return art_url
+
+itunes_cache = ItunesArtworkCache()
 
 def lookup_artwork_via_itunes(artist, track):
     if not artist or not track:
         return None
-    query = f"{track} {artist}"
-    response = requests.get(
-        "https://itunes.apple.com/search",
-        params={"term": query, "media": "music", "limit": 1},
-    )
-    results = response.json().get("results", [])
-    if results:
-        art_url = results[0].get("artworkUrl100")
-        if art_url:
-            return art_url.replace("100x100bb", "1200x1200bb")
-    return None
+    return itunes_cache.lookup(artist, track)
+
+class ArtworkCache:
+    """Content-addressed cache of finished BMP renditions with an LRU byte budget"""
+
+    def __init__(self, directory=ARTWORK_CACHE_DIR, max_bytes=ARTWORK_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries = None  # OrderedDict name -> size, least recently used first
+        self.total_bytes = 0
+
+    def _load_index(self):
+        """Rebuild the LRU index from the cache directory (file mtime = last use)"""
+        if self.entries is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith((".bmp", ".jpg")) and os.path.isfile(path):
+                stat = os.stat(path)
+                files.append((stat.st_mtime, name, stat.st_size))
+        self.entries = OrderedDict((name, size) for _, name, size in sorted(files))
+        self.total_bytes = sum(self.entries.values())
+        logger.info(f"Artwork cache: {len(self.entries)} renditions, {self.total_bytes / 1024 / 1024:.1f} MB")
+
+    def get(self, name, dest_path):
+        """Copy a cached rendition to dest_path - returns False on a cache miss"""
+        self._load_index()
+        if name not in self.entries:
+            return False
+        cached_path = os.path.join(self.directory, name)
+        temp_path = dest_path + ".temp"
+        try:
+            shutil.copyfile(cached_path, temp_path)
+            os.replace(temp_path, dest_path)
+        except OSError as e:
+            logger.warning(f"Artwork cache read failed for {name}: {e}")
+            self._remove(name)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+        os.utime(cached_path)  # Mark as recently used
+        self.entries.move_to_end(name)
+        return True
+
+    def path(self, name):
+        """Path of a cached file, marked as recently used - None on a cache miss"""
+        self._load_index()
+        if name not in self.entries:
+            return None
+        cached_path = os.path.join(self.directory, name)
+        try:
+            os.utime(cached_path)
+        except OSError:
+            self._remove(name)
+            return None
+        self.entries.move_to_end(name)
+        return cached_path
+
+    def put(self, name, src_path):
+        """Store a finished rendition and evict least recently used entries over budget"""
+        self._load_index()
+        cached_path = os.path.join(self.directory, name)
+        temp_path = cached_path + ".temp"
+        try:
+            shutil.copyfile(src_path, temp_path)
+            os.replace(temp_path, cached_path)
+        except OSError as e:
+            logger.warning(f"Artwork cache write failed for {name}: {e}")
+            return
+        if name in self.entries:
+            self.total_bytes -= self.entries.pop(name)
+        size = os.path.getsize(cached_path)
+        self.entries[name] = size
+        self.total_bytes += size
+
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            oldest = next(iter(self.entries))
+            self._remove(oldest)
+            logger.debug(f"Artwork cache evicted {oldest}")
+
+    def _remove(self, name):
+        self.total_bytes -= self.entries.pop(name, 0)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+
+def artwork_cache_key(url, artist="", album=""):
+    """Key artwork by (artist, album) when known, otherwise by its URL"""
+    artist = clean_metadata_value(artist).lower()
+    album = clean_metadata_value(album).lower()
+    if artist and album:
+        source = f"album|{artist}|{album}"
+    else:
+        source = f"url|{url}"
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+def track_text_key(title, artist, album):
+    """Short hash of the track text, for renditions that draw the metadata"""
+    text = "|".join(clean_metadata_value(value) for value in (title, artist, album))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+artwork_cache = ArtworkCache()
+
+class ArtworkRendition:
+    """One image produced from the decoded artwork (square, bar, future sizes), written in one or more encodings"""
+
+    def __init__(self, name, render, outputs, per_track=False, required=True, to_qualia=False):
+        self.name = name
+        self.render = render  # render(source, title, artist, album, art_key) -> PIL image
+        self.outputs = outputs  # Encoding suffix (see RENDITION_ENCODERS) -> served file path
+        self.per_track = per_track  # Draws the track text, so it changes within an album
+        self.required = required  # A failure aborts the job instead of being logged
+        self.to_qualia = to_qualia  # Also copied to the USB-mounted Qualia display
+
+    @property
+    def path(self):
+        """The plain BMP output - the reference copy every other encoding is made from"""
+        return self.outputs[".bmp"]
+
+    def cache_name(self, art_key, title, artist, album, suffix=".bmp"):
+        if self.per_track:
+            return f"{art_key}_{self.name}_{track_text_key(title, artist, album)}{suffix}"
+        return f"{art_key}_{self.name}{suffix}"
+
+    def restore(self, art_key, title, artist, album):
+        """Copy every encoding from the artwork cache - False if any of them is missing"""
+        return all(
+            artwork_cache.get(self.cache_name(art_key, title, artist, album, suffix), path)
+            for suffix, path in self.outputs.items()
+        )
+
+RLE8_RUN = re.compile(rb"(.)\1\1+", re.DOTALL)  # Runs of 3+ identical palette indices
+
+def encode_rle8_row(row, out):
+    """Append one BI_RLE8 scanline: runs of 3+ as encoded pairs, everything between them as literals"""
+    position = 0
+    for match in RLE8_RUN.finditer(row):
+        write_rle8_literal(row[position:match.start()], out)
+        value = row[match.start()]
+        run_length = match.end() - match.start()
+        while run_length:
+            count = min(run_length, 255)
+            out += bytes((count, value))
+            run_length -= count
+        position = match.end()
+    write_rle8_literal(row[position:], out)
+
+def write_rle8_literal(literal, out):
+    """Write literal pixels - absolute mode takes 3 to 255 bytes and is padded to a word boundary"""
+    for start in range(0, len(literal), 255):
+        block = literal[start:start + 255]
+        if len(block) >= 3:
+            out += bytes((0, len(block)))
+            out += block
+            if len(block) % 2:
+                out.append(0)
+        else:
+            for value in block:
+                out += bytes((1, value))
+
+def save_bmp(image, path):
+    """Uncompressed 8-bit BMP - readable by adafruit_imageload on any board"""
+    image.save(path, format="BMP", compression=0)
+
+def save_bmp_rle8(image, path):
+    """8-bit BI_RLE8 BMP - Pillow only decodes RLE8, so the file is assembled here"""
+    if image.mode != "P":
+        image = image.convert("P", palette=Image.ADAPTIVE)
+    width, height = image.size
+    palette = image.getpalette()
+    colors = len(palette) // 3
+
+    # Bottom-up scanlines, each ending with an end-of-line marker, the last with end-of-bitmap
+    pixels = image.tobytes()
+    data = bytearray()
+    for y in range(height - 1, -1, -1):
+        encode_rle8_row(pixels[y * width:(y + 1) * width], data)
+        data += b"\x00\x00" if y else b"\x00\x01"
+
+    color_table = bytearray()
+    for index in range(colors):
+        red, green, blue = palette[index * 3:index * 3 + 3]
+        color_table += bytes((blue, green, red, 0))
+
+    pixel_offset = 14 + 40 + len(color_table)
+    with open(path, "wb") as f:
+        f.write(b"BM" + (pixel_offset + len(data)).to_bytes(4, "little") + bytes(4) + pixel_offset.to_bytes(4, "little"))
+        f.write(b"".join(value.to_bytes(size, "little", signed=signed) for value, size, signed in (
+            (40, 4, False), (width, 4, True), (height, 4, True), (1, 2, False), (8, 2, False),
+            (1, 4, False),  # BI_RLE8
+            (len(data), 4, False), (2835, 4, True), (2835, 4, True), (colors, 4, False), (colors, 4, False),
+        )))
+        f.write(color_table)
+        f.write(data)
+
+def save_jpeg(image, path):
+    """Baseline (non-progressive) JPEG of the rendition, for boards with jpegio"""
+    image.convert("RGB").save(path, format="JPEG", quality=JPEG_QUALITY, progressive=False, optimize=True)
+
+# Encoders by output suffix - the suffix also names the encoding's copy in the artwork cache
+RENDITION_ENCODERS = {
+    ".bmp": save_bmp,
+    ".rle.bmp": save_bmp_rle8,
+    ".jpg": save_jpeg,
+}
+
+def save_rendition(image, path, encoder=save_bmp):
+    """Encode a rendition once, straight to its final location via a temp file"""
+    temp_path = path + ".temp"
+    try:
+        encoder(image, temp_path)
+        shutil.move(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    file_size = os.path.getsize(path)
+    print(f"✓ Wrote {image.width}x{image.height} {image.mode} rendition: {path} ({file_size:,} bytes)")
+
+def render_artwork_renditions(source, renditions, art_key, title, artist, album):
+    """Render each rendition from one in-memory source, write each encoding once and cache it"""
+    for rendition in renditions:
+        try:
+            image = rendition.render(source, title, artist, album, art_key)
+            for suffix, path in rendition.outputs.items():
+                save_rendition(image, path, RENDITION_ENCODERS[suffix])
+        except Exception as e:
+            if rendition.required:
+                raise
+            print(f"✗ {rendition.name} rendition failed: {e}")
+            continue
+        for suffix, path in rendition.outputs.items():
+            artwork_cache.put(rendition.cache_name(art_key, title, artist, album, suffix), path)
+        if rendition.to_qualia:
+            copy_to_qualia(rendition.path)
+
+def publish_extra_encodings():
+    """Re-encode the BMPs written outside the rendition pipeline (placeholders, blank screen)"""
+    for rendition in artwork_renditions:
+        if not os.path.exists(rendition.path):
+            continue
+        try:
+            with Image.open(rendition.path) as image:
+                image.load()
+                for suffix, path in rendition.outputs.items():
+                    if suffix != ".bmp":
+                        save_rendition(image, path, RENDITION_ENCODERS[suffix])
+        except Exception as e:
+            print(f"✗ Could not re-encode {rendition.path}: {e}")
 
 @safe_write
 def copy_to_qualia(bmp_path):
@@ -180,78 +664,85 @@ def copy_to_qualia(bmp_path):
         print(f"✗ Failed to copy to Qualia: {e}")
         return False
 
+def decode_artwork(data, size):
+    """Decode downloaded artwork to RGB at no less than size x size, skipping needless full-size decodes"""
+    img = Image.open(BytesIO(data))
+    width, height = img.size
+    if img.format == "JPEG":
+        # DCT scaling: libjpeg decodes at 1/2, 1/4 or 1/8 scale, never below the requested size
+        img.draft("RGB", (size, size))
+    else:
+        # Other formats decode fully - box-reduce by an integer factor before the LANCZOS pass
+        factor = min(width // size, height // size)
+        if factor >= 2:
+            if img.mode not in ("RGB", "L", "RGBA", "LA"):
+                img = img.convert("RGB")  # reduce() rejects palette, 1-bit and 16-bit images
+            img = img.reduce(factor)
+    if img.size != (width, height):
+        print(f"Decoded {width}x{height} artwork at {img.size[0]}x{img.size[1]}")
+    return img.convert("RGB")
+
 @safe_write
-def download_and_convert_artwork(url, jpg_path, bmp_path):
-    """Download artwork and convert to BMP format with advanced processing"""
+def download_and_convert_artwork(url, bmp_path, title="", artist="", album="", job=None):
+    """Download artwork, decode it once and produce every registered rendition from memory"""
+    global last_rendered_art_key
+
+    art_key = artwork_cache_key(url, artist, album)
+
+    # Same album as the last render: the artwork-only renditions on disk are already correct
+    same_artwork = art_key == last_rendered_art_key and os.path.exists(bmp_path)
+    if same_artwork:
+        print("✓ Same artwork as previous track - re-rendering track text only")
+
+    # Repeat artwork: one file copy per cached rendition instead of a render
+    pending = []
+    for rendition in artwork_renditions:
+        if same_artwork and not rendition.per_track:
+            continue
+        if rendition.restore(art_key, title, artist, album):
+            print(f"✓ {rendition.name} rendition served from cache: {art_key[:12]}")
+            if rendition.to_qualia:
+                copy_to_qualia(rendition.path)
+        else:
+            pending.append(rendition)
+
+    if not any(not rendition.per_track for rendition in pending) and (not pending or bar_tile_available(art_key)):
+        # Only track text changed - render it against the bar tile kept in memory or in the
+        # artwork cache. Without one, fall through and decode the original artwork again:
+        # rebuilding the tile from the 64-colour square BMP would quantize it twice.
+        last_rendered_art_key = art_key
+        render_artwork_renditions(bmp_path, pending, art_key, title, artist, album)
+        return
+
+    # Nothing expensive has happened yet - give up if a newer song arrived
+    check_render_job(job)
+
     try:
         response = requests.get(url, timeout=10)
         response.raise_for_status()
+        check_render_job(job)  # Skip decode + render if superseded during download
         
-        # Create temporary file path
-        temp_bmp = bmp_path + ".temp"
+        # Decode once - every rendition is rendered from this in-memory RGB image
+        img = decode_artwork(response.content, 720)
         
-        try:
-            # Convert to CircuitPython-compatible BMP
-            img = Image.open(BytesIO(response.content)).convert("RGB")
-            
-            # Ensure exactly 720x720 pixels for the display
-            img = img.resize((720, 720), Image.LANCZOS)  # High-quality resizing
-            
-            # Pre-process the image for better color reduction
-            # Apply slight sharpening to improve detail
-            enhancer = ImageEnhance.Sharpness(img)
-            img = enhancer.enhance(1.1)  # Very slight sharpening
-            
-            # Adjust contrast to make colors pop
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(1.05)  # Very slight contrast boost
-            
-            # Convert to 8-bit indexed color optimized for ESP32 processing
-            # Use simpler quantization for faster ESP32 loading
-            img_8bit = img.quantize(
-                colors=64,   # Reduced from 256 - ESP32 processes fewer colors faster
-                method=0,    # Simple quantization for faster processing
-                dither=0     # No dithering - simpler for ESP32 to process
-            )
-            
-            # Save as BMP to temporary file
-            img_8bit.save(temp_bmp, format="BMP", compression=0)
-            
-            # Verify the temporary BMP file
-            verify_img = Image.open(temp_bmp)
-            print(f"Verification: {verify_img.size}, mode: {verify_img.mode}")
-            
-            # Get file size for reference
-            file_size = os.path.getsize(temp_bmp)
-            print(f"File size: {file_size:,} bytes ({file_size / 1024 / 1024:.1f} MB)")
-            
-            # Only after successful verification, move the file to its final location
-            shutil.move(temp_bmp, bmp_path)
-            
-            print(f"Successfully moved BMP to final location: {bmp_path}")
-            
-            # Copy to Qualia display
-            copy_to_qualia(bmp_path)
-            
-            # Create the 960x320 composite bar artwork with text
-            try:
-                if create_bar_artwork(bmp_path, BMP_BAR_PATH, current_song_title, current_song_artist, current_song_album):
-                    print("✓ Bar composite successfully created")
-                else:
-                    print("✗ Bar composite creation failed")
-            except Exception as bar_error:
-                print(f"✗ Bar composite creation error: {bar_error}")
-                import traceback
-                print("Bar composite error traceback:")
-                print(traceback.format_exc())
-            
-        except Exception as e:
-            # Clean up temporary file if anything goes wrong
-            print(f"Error during conversion: {e}")
-            if os.path.exists(temp_bmp):
-                os.remove(temp_bmp)
-            raise
+        # Ensure exactly 720x720 pixels for the display
+        img = img.resize((720, 720), Image.LANCZOS)  # High-quality resizing
+        
+        # Pre-process the image for better color reduction
+        # Apply slight sharpening to improve detail
+        enhancer = ImageEnhance.Sharpness(img)
+        img = enhancer.enhance(1.1)  # Very slight sharpening
+        
+        # Adjust contrast to make colors pop
+        enhancer = ImageEnhance.Contrast(img)
+        img = enhancer.enhance(1.05)  # Very slight contrast boost
+        
+        check_render_job(job)  # Don't replace the files on disk for a superseded song
+        render_artwork_renditions(img, pending, art_key, title, artist, album)
+        last_rendered_art_key = art_key
             
+    except RenderJobSuperseded:
+        raise
     except Exception as e:
         print(f"Artwork download/convert failed: {e}")
         raise
@@ -278,8 +769,11 @@ def save_placeholder_usage(usage_data):
         print(f"Error saving placeholder usage file: {e}")
 
 @safe_write
-def use_random_placeholder_image(bmp_path):
+def use_random_placeholder_image(bmp_path, title="", artist="", album=""):
     """Use a random placeholder image from MIL1.bmp to MIL6.bmp"""
+    global last_rendered_art_key
+    last_rendered_art_key = None  # The square BMP no longer holds album artwork
+    
     # Get the directory where artwork.bmp is stored
     base_dir = os.path.dirname(bmp_path)
     
@@ -321,7 +815,7 @@ def use_random_placeholder_image(bmp_path):
         
         # Create the 960x320 composite bar artwork from placeholder
         try:
-            if create_bar_artwork(bmp_path, BMP_BAR_PATH, current_song_title, current_song_artist, current_song_album):
+            if create_bar_artwork(bmp_path, BMP_BAR_PATH, title, artist, album):
                 print("✓ Bar composite from placeholder successfully created")
             else:
                 print("✗ Bar composite from placeholder creation failed")
@@ -337,6 +831,8 @@ def use_random_placeholder_image(bmp_path):
 
 def create_test_image(bmp_path):
     """Create a test image for debugging (fallback)"""
+    global last_rendered_art_key
+    last_rendered_art_key = None
     print("Creating test image...")
     
     # Create a colorful test pattern
@@ -471,6 +967,8 @@ def extract_siriusxm_metadata(metadata_xml):
 
 def create_blank_screen(bmp_path):
     """Create a completely black/blank screen"""
+    global last_rendered_art_key
+    last_rendered_art_key = None
     try:
         print("Creating blank screen...")
         
@@ -509,6 +1007,85 @@ def create_blank_screen(bmp_path):
         print(f"✗ Error creating blank screen: {e}")
         return False
 
+def resolve_artwork_url(speaker, soco_track, control_track, title, artist, album):
+    """Find the artwork URL for the current track - Control API is only consulted when SoCo lacks it"""
+    uri = soco_track.get("uri", "")
+    metadata = soco_track.get("metadata", "")
+
+    # Try to get artwork in order of preference:
+    # 1. SoCo album_art
+    art_url = soco_track.get("album_art")
+    if art_url and not art_url.startswith("http"):
+        art_url = f"http://{speaker.ip_address}:1400{art_url}"
+
+    # 2. Sonos Control API artwork
+    if not art_url:
+        art_url = control_track.get("artwork")
+
+    # Channel/service are only needed for SiriusXM detection
+    channel = None
+    service = None
+    if not art_url:
+        # Try different ways to detect SiriusXM
+        channel = control_track.get("channel") or soco_track.get("channel")
+        service = control_track.get("service") or soco_track.get("service")
+
+        print("\nDEBUG - Service detection:")
+        print(f"Channel: {channel}")
+        print(f"Service: {service}")
+        print(f"URI: {uri}")
+
+    # 3. SiriusXM artwork from metadata
+    if not art_url and "siriusxm.com" in metadata:
+        print("Found SiriusXM metadata, extracting artwork URL and channel info...")
+        art_url, siriusxm_channel = extract_siriusxm_metadata(metadata)
+        if art_url:
+            print(f"Found SiriusXM artwork URL: {art_url}")
+        if siriusxm_channel:
+            print(f"Found SiriusXM channel: {siriusxm_channel}")
+            channel = siriusxm_channel  # Update channel name
+
+    # 4. SiriusXM website (if on SiriusXM)
+    is_siriusxm = (
+        (channel and "siriusxm" in channel.lower()) or
+        (service and "siriusxm" in service.lower()) or
+        (uri and "siriusxm" in uri.lower()) or
+        "siriusxm.com" in metadata
+    )
+    
+    print(f"\nDEBUG - SiriusXM detection: {is_siriusxm}")
+    
+    if not art_url and is_siriusxm:
+        print("Trying SiriusXM website...")
+        # Try to get channel name from various sources
+        channel_name = (
+            channel or 
+            service or 
+            uri.split("/")[-1] if uri else None
+        )
+        print(f"Using channel name: {channel_name}")
+        art_url = get_siriusxm_artwork(channel_name, artist, title)
+
+    # 5. Skip Spotify for now to reduce API calls
+    # if not art_url:
+    #     print("Trying Spotify artwork...")
+    #     art_url = get_spotify_artwork(artist, title)
+
+    # 6. iTunes lookup - only if no other source found
+    if not art_url:
+        print("No artwork from Sonos or streaming services, trying iTunes...")
+        art_url = lookup_artwork_via_itunes(artist, title)
+
+    print("\nFinal metadata:")
+    print("Title:  ", title)
+    print("Artist: ", artist)
+    print("Album:  ", album)
+    print("Channel:", channel)
+    print("Service:", service)
+    print("Artwork:", art_url or "None")
+
+    return art_url
+
 def is_music_playing(soco_track, control_track):
     """Check if music is currently playing"""
     # Check if there's a title and it's not empty
@@ -550,256 +1127,251 @@ def is_music_playing(soco_track, control_track):
     # 3. Position is advancing (even if duration is 0:00:00)
     return has_title and (has_playback or is_playing or position_advancing)
 
-@safe_write
-def create_bar_artwork(source_bmp_path, bar_bmp_path, title="", artist="", album=""):
-    """Create a 960x320 composite image with artwork on left and text on right"""
-    try:
-        print(f"Creating bar composite from: {source_bmp_path}")
-        print(f"Metadata: {title} - {artist} - {album}")
-        
-        # Create proper 960x320 composite for bar display
-        composite_width = 960   # Full width for bar display
-        composite_height = 320  # Full height for bar display
-        artwork_size = 320      # Square artwork on left side
-        
-        # Create the composite image with dark background
-        composite = Image.new('RGB', (composite_width, composite_height), (20, 20, 20))
-        
-        # Add artwork on the left if available
-        if os.path.exists(source_bmp_path):
-            file_size = os.path.getsize(source_bmp_path)
-            if file_size > 1000:  # Valid file
-                try:
-                    # Load and resize artwork
-                    artwork = Image.open(source_bmp_path)
-                    if artwork.mode != 'RGB':
-                        artwork = artwork.convert('RGB')
-                    
-                    # Resize to 320x320 and paste on left side
-                    artwork_resized = artwork.resize((artwork_size, artwork_size), Image.LANCZOS)
-                    composite.paste(artwork_resized, (0, 0))
-                    print("✓ Artwork added to composite")
-                except Exception as e:
-                    print(f"⚠️ Artwork processing failed: {e}")
-        
-        # Add text on the right side
+def bar_tile_cache_name(art_key):
+    """Artwork cache entry holding the finished bar tile for an album"""
+    return f"{art_key}_bar_tile.bmp"
+
+def bar_tile_available(art_key):
+    """True when the bar tile for art_key can be had without decoding the artwork"""
+    if bar_tile_cache["key"] == art_key:
+        return True
+    return artwork_cache.path(bar_tile_cache_name(art_key)) is not None
+
+def load_bar_artwork_tile(source, art_key=None):
+    """Get the quantized, portrait-rotated 320x320 artwork tile - reused while the artwork is unchanged
+    
+    source is either the decoded RGB artwork or the path of a square BMP (placeholders).
+    Tiles made from decoded artwork are kept in the artwork cache, so a restart or a
+    returning album never rebuilds one from the already-quantized square BMP.
+    """
+    global bar_tile_cache
+
+    if art_key and bar_tile_cache["key"] == art_key:
+        print("✓ Reusing cached artwork tile (same album)")
+        return bar_tile_cache["tile"]
+
+    cached_path = artwork_cache.path(bar_tile_cache_name(art_key)) if art_key else None
+    if cached_path:
         try:
-            draw = ImageDraw.Draw(composite)
-            
-            # Text area: starts after artwork - proper spacing for 960x320
-            text_start_x = artwork_size + 20  # Proper margin for full-size composite
-            text_width = composite_width - artwork_size - 40  # Available width for text
-            
-            # Try to load a font, fallback to default
+            with Image.open(cached_path) as cached:
+                cached.load()
+                tile = cached.copy()
+            print("✓ Artwork tile served from cache")
+            bar_tile_cache = {"key": art_key, "tile": tile}
+            return tile
+        except Exception as e:
+            print(f"⚠️ Cached artwork tile unreadable: {e}")
+
+    tile = None
+    artwork = source if isinstance(source, Image.Image) else None
+    if artwork is None and source and os.path.exists(source):
+        file_size = os.path.getsize(source)
+        if file_size > 1000:  # Valid file
             try:
-                # Try to find a system font
-                font_large = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 46)
-                font_medium = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 36)
-                font_small = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 28)
-            except:
-                try:
-                    # Linux font path
-                    font_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 46)
-                    font_medium = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 36)
-                    font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 28)
-                except:
-                    # Fallback to default font
-                    font_large = ImageFont.load_default()
-                    font_medium = ImageFont.load_default()
-                    font_small = ImageFont.load_default()
+                artwork = Image.open(source)
+            except Exception as e:
+                print(f"⚠️ Artwork processing failed: {e}")
+    if artwork is not None:
+        try:
+            if artwork.mode != 'RGB':
+                artwork = artwork.convert('RGB')
             
+            # Resize to 320x320 and reduce to the artwork share of the palette
+            artwork_resized = artwork.resize((BAR_ARTWORK_SIZE, BAR_ARTWORK_SIZE), Image.LANCZOS)
+            tile = artwork_resized.quantize(colors=BAR_ARTWORK_COLORS, method=0, dither=0)
+            # Pre-rotated for the portrait frame - done once per album, not once per track
+            tile = tile.transpose(Image.ROTATE_270)
+            print("✓ Artwork tile prepared")
+            if art_key and isinstance(source, Image.Image):
+                store_bar_artwork_tile(tile, art_key)
+        except Exception as e:
+            print(f"⚠️ Artwork processing failed: {e}")
+
+    bar_tile_cache = {"key": art_key if tile else None, "tile": tile}
+    return tile
+
+def store_bar_artwork_tile(tile, art_key):
+    """Keep a tile made from decoded artwork in the artwork cache"""
+    temp_path = os.path.join(artwork_cache.directory, bar_tile_cache_name(art_key) + ".new")
+    try:
+        os.makedirs(artwork_cache.directory, exist_ok=True)
+        tile.save(temp_path, "BMP")
+        artwork_cache.put(bar_tile_cache_name(art_key), temp_path)
+    except OSError as e:
+        print(f"⚠️ Could not cache artwork tile: {e}")
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def longest_fitting_prefix(count, fits):
+    """Largest k in 0..count for which fits(k) holds - fits must be monotonic (binary search)"""
+    low, high = 0, count
+    while low < high:
+        middle = (low + high + 1) // 2
+        if fits(middle):
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+class BarTextRenderer:
+    """Text renderer for the bar composite - resolves the font once and caches faces by size"""
+
+    def __init__(self, font_candidates=BAR_FONT_CANDIDATES):
+        # Resolve the font file once instead of trying each path on every render
+        self.font_path = next((path for path in font_candidates if os.path.exists(path)), None)
+        self.fonts = {}  # size -> FreeTypeFont
+        self.layouts = OrderedDict()  # (text, size, width, max lines) -> lines, least recently used first
+
+    def font(self, size):
+        """Get a loaded font face, opening the font file only the first time a size is used"""
+        font = self.fonts.get(size)
+        if font is None:
+            try:
+                font = ImageFont.truetype(self.font_path, size) if self.font_path else ImageFont.load_default()
+            except OSError as e:
+                logger.warning(f"Could not load font {self.font_path}: {e}")
+                font = ImageFont.load_default()
+            self.fonts[size] = font
+        return font
+
+    def preload(self):
+        """Load all bar font sizes up front (at startup)"""
+        for size in (BAR_TITLE_FONT_SIZE, BAR_ARTIST_FONT_SIZE, BAR_ALBUM_FONT_SIZE):
+            self.font(size)
+        logger.info(f"✓ Bar fonts loaded from {self.font_path or 'Pillow default font'}")
+
+    def layout(self, text, size, max_width=BAR_TEXT_WIDTH, max_lines=BAR_TEXT_MAX_LINES):
+        """Wrap text to max_width pixels on at most max_lines lines, ellipsizing the last one (memoized)"""
+        key = (text, size, max_width, max_lines)
+        lines = self.layouts.get(key)
+        if lines is not None:
+            self.layouts.move_to_end(key)
+            return lines
+
+        font = self.font(size)
+        lines = []
+        words = text.split()
+        while words and len(lines) < max_lines:
+            # Most words that fit on this line, measured in pixels
+            count = longest_fitting_prefix(len(words), lambda k: font.getlength(" ".join(words[:k])) <= max_width)
+            if len(lines) == max_lines - 1 and count < len(words):
+                lines.append(self.ellipsize(font, words, max_width))
+                break
+            if count == 0:
+                # A single word wider than the line - break it between characters
+                word = words[0]
+                chars = max(1, longest_fitting_prefix(len(word), lambda k: font.getlength(word[:k]) <= max_width))
+                lines.append(word[:chars])
+                words[0] = word[chars:]
+                continue
+            lines.append(" ".join(words[:count]))
+            words = words[count:]
+
+        lines = tuple(lines)
+        self.layouts[key] = lines
+        if len(self.layouts) > BAR_LAYOUT_CACHE_SIZE:
+            self.layouts.popitem(last=False)
+        return lines
+
+    def ellipsize(self, font, words, max_width):
+        """Longest whole-word prefix that fits with "..." appended, cut between characters if no word fits"""
+        count = longest_fitting_prefix(len(words), lambda k: font.getlength(" ".join(words[:k]) + "...") <= max_width)
+        if count:
+            return " ".join(words[:count]) + "..."
+        text = " ".join(words)
+        chars = longest_fitting_prefix(len(text), lambda k: font.getlength(text[:k] + "...") <= max_width)
+        return text[:chars].rstrip() + "..."
+
+    def render_panel(self, title="", artist="", album=""):
+        """Render the right-hand text panel (640x320) and quantize it to the text share of the palette"""
+        panel = Image.new('RGB', (BAR_WIDTH - BAR_ARTWORK_SIZE, BAR_HEIGHT), BAR_BACKGROUND)
+        try:
+            draw = ImageDraw.Draw(panel)
+        
             # Text layout - align to top with variable spacing
-            line_height = 40   # Line height within each text block
-            artist_to_title_spacing = 55  # Spacing between artist and title
-            title_to_album_spacing = 73   # Spacing between title and album
-            y_start = 20       # Moved up from 40 to align to top
-            current_y = y_start
-            
-            # Artist (top line, white) - with word wrapping and ellipsis
-            clean_artist = clean_metadata_value(artist)
-            if clean_artist:
-                max_chars_per_line = 30  # Slightly more for medium font
-                words = clean_artist.split()
-                lines = []
-                current_line = ""
-                
-                for word in words:
-                    test_line = current_line + (" " if current_line else "") + word
-                    if len(test_line) <= max_chars_per_line:
-                        current_line = test_line
-                    else:
-                        if current_line:
-                            lines.append(current_line)
-                            current_line = word
-                        else:
-                            # Single word is too long, just add it
-                            lines.append(word)
-                
-                if current_line:
-                    lines.append(current_line)
-                
-                # Handle truncation with ellipsis if more than 2 lines
-                if len(lines) > 2:
-                    # Truncate to 2 lines and add ellipsis
-                    lines = lines[:2]
-                    # Make sure ellipsis fits on the second line
-                    while len(lines[1] + "...") > max_chars_per_line and " " in lines[1]:
-                        words_in_line = lines[1].split()
-                        lines[1] = " ".join(words_in_line[:-1])
-                    lines[1] += "..."
-                
-                # Draw each line of the artist
-                for i, line in enumerate(lines[:2]):  # Max 2 lines for artist
-                    draw.text((text_start_x, current_y + (i * line_height)), line, 
-                             fill=(255, 255, 255), font=font_medium)
-                    print(f"✓ Added artist line {i+1}: {line}")
-                
-                # Advance based on actual number of artist lines used
-                artist_lines_used = min(len(lines), 2)
-                if artist_lines_used > 1:
-                    # Multi-line artist: advance by the space used by all lines plus spacing to title
-                    current_y += (artist_lines_used * line_height) + (artist_to_title_spacing - line_height)
-                else:
-                    # Single line artist: normal spacing to title
-                    current_y += artist_to_title_spacing
-            else:
-                print("✓ Artist data missing - skipping")
+            current_y = 20  # Moved up from 40 to align to top
+        
+            # (name, text, font size, color, line height within the block, spacing to the next block)
+            blocks = (
+                ("artist", artist, BAR_ARTIST_FONT_SIZE, (255, 255, 255), 40, 55),  # Top line, white
+                ("title", title, BAR_TITLE_FONT_SIZE, (255, 221, 0), 51, 73),  # Middle line, gold
+                ("album", album, BAR_ALBUM_FONT_SIZE, (200, 200, 200), 40, 0),  # Bottom line, gray
+            )
+            for name, text, size, fill, line_height, spacing in blocks:
+                clean_text = clean_metadata_value(text)
+                if not clean_text:
+                    print(f"✓ {name.capitalize()} data missing - skipping")
+                    continue
             
-            # Title (middle line, gold) - with word wrapping and ellipsis
-            clean_title = clean_metadata_value(title)
-            if clean_title:
-                title_text = clean_title  # No music note for more space
-                
-                # Word wrapping for long titles - increased limit without music note
-                max_chars_per_line = 22  # Increased from 20 since no music note
-                words = title_text.split()
-                lines = []
-                current_line = ""
-                
-                for word in words:
-                    test_line = current_line + (" " if current_line else "") + word
-                    if len(test_line) <= max_chars_per_line:
-                        current_line = test_line
-                    else:
-                        if current_line:
-                            lines.append(current_line)
-                            current_line = word
-                        else:
-                            # Single word is too long, just add it
-                            lines.append(word)
-                
-                if current_line:
-                    lines.append(current_line)
-                
-                # Handle truncation with ellipsis if more than 2 lines
-                if len(lines) > 2:
-                    # Truncate to 2 lines and add ellipsis
-                    lines = lines[:2]
-                    # Make sure ellipsis fits on the second line
-                    while len(lines[1] + "...") > max_chars_per_line and " " in lines[1]:
-                        words_in_line = lines[1].split()
-                        lines[1] = " ".join(words_in_line[:-1])
-                    lines[1] += "..."
-                
-                # Draw each line of the title with proper spacing
-                title_line_height = 51  # Increased by 3 more pixels (48 + 3)
-                for i, line in enumerate(lines[:2]):  # Max 2 lines for title
-                    draw.text((text_start_x, current_y + (i * title_line_height)), line, 
-                             fill=(255, 221, 0), font=font_large)
-                    print(f"✓ Added title line {i+1}: {line}")
-                
-                # Advance based on actual number of title lines used
-                title_lines_used = min(len(lines), 2)
-                if title_lines_used > 1:
-                    # Multi-line title: advance by the space used by all lines plus spacing to album
-                    current_y += (title_lines_used * title_line_height) + (title_to_album_spacing - title_line_height)
-                else:
-                    # Single line title: normal spacing to album
-                    current_y += title_to_album_spacing
-            else:
-                print("✓ Title data missing - skipping")
-
-            # Album (bottom line, gray) - with word wrapping and ellipsis
-            clean_album = clean_metadata_value(album)
-            if clean_album:
-                max_chars_per_line = 34  # More for smaller font
-                words = clean_album.split()
-                lines = []
-                current_line = ""
-                
-                for word in words:
-                    test_line = current_line + (" " if current_line else "") + word
-                    if len(test_line) <= max_chars_per_line:
-                        current_line = test_line
-                    else:
-                        if current_line:
-                            lines.append(current_line)
-                            current_line = word
-                        else:
-                            # Single word is too long, just add it
-                            lines.append(word)
-                
-                if current_line:
-                    lines.append(current_line)
-                
-                # Handle truncation with ellipsis if more than 2 lines
-                if len(lines) > 2:
-                    # Truncate to 2 lines and add ellipsis
-                    lines = lines[:2]
-                    # Make sure ellipsis fits on the second line
-                    while len(lines[1] + "...") > max_chars_per_line and " " in lines[1]:
-                        words_in_line = lines[1].split()
-                        lines[1] = " ".join(words_in_line[:-1])
-                    lines[1] += "..."
-                
-                # Draw each line of the album
-                for i, line in enumerate(lines[:2]):  # Max 2 lines for album
-                    draw.text((text_start_x, current_y + (i * line_height)), line, 
-                             fill=(200, 200, 200), font=font_small)
-                    print(f"✓ Added album line {i+1}: {line}")
-                
-                # Final section doesn't need to advance current_y
-            else:
-                print("✓ Album data missing - skipping")
+                # Font faces and line layouts are cached - repeat artists and albums skip both
+                font = self.font(size)
+                lines = self.layout(clean_text, size)
+                for i, line in enumerate(lines):
+                    draw.text((BAR_TEXT_MARGIN, current_y + (i * line_height)), line, fill=fill, font=font)
+                    print(f"✓ Added {name} line {i+1}: {line}")
             
+                # Advance past the lines actually used, then the gap to the next block
+                current_y += spacing + (len(lines) - 1) * line_height
+        
         except Exception as text_error:
             print(f"⚠️ Text rendering failed: {text_error}")
             # Continue without text if font rendering fails
-        
-        # CRITICAL: Rotate the composite 90 degrees clockwise for portrait display
-        print("Rotating composite 90° clockwise for portrait display...")
-        composite_rotated = composite.rotate(-90, expand=True)  # -90 = clockwise rotation
-        print(f"✓ Rotated: {composite.width}x{composite.height} → {composite_rotated.width}x{composite_rotated.height}")
-        
-        # Save the rotated composite
-        temp_bmp = bar_bmp_path + ".temp"
-        print(f"Saving rotated composite to: {temp_bmp}")
-        
-        try:
-            # Convert to indexed color optimized for ESP32 processing
-            composite_rotated_indexed = composite_rotated.quantize(colors=64, method=0, dither=0)
-            composite_rotated_indexed.save(temp_bmp, format="BMP", compression=0)
-            
-            # Verify the file
-            temp_size = os.path.getsize(temp_bmp)
-            print(f"Rotated composite file size: {temp_size} bytes")
-            
-            verify_img = Image.open(temp_bmp)
-            print(f"Rotated composite verification: {verify_img.size}, mode: {verify_img.mode}")
-            
-            # Move to final location
-            shutil.move(temp_bmp, bar_bmp_path)
-            
-            final_size = os.path.getsize(bar_bmp_path)
-            print(f"✓ Rotated bar composite created: {bar_bmp_path} ({final_size} bytes)")
-            print(f"✓ Ready for portrait display: 320x960 (no ESP32 rotation needed)")
-            return True
-            
-        except Exception as e:
-            print(f"✗ Error saving composite: {e}")
-            if os.path.exists(temp_bmp):
-                os.remove(temp_bmp)
-            raise
+
+        return panel.quantize(colors=BAR_TEXT_COLORS, method=0, dither=0)
+
+bar_text_renderer = BarTextRenderer()
+
+def render_bar_text_panel(title="", artist="", album=""):
+    """Render the bar text panel with the shared renderer"""
+    return bar_text_renderer.render_panel(title, artist, album)
+
+def compose_bar_image(source, title="", artist="", album="", art_key=None):
+    """Compose the bar (artwork, then text) directly in the 320x960 portrait frame
+    
+    The layout is the 960x320 landscape design turned 90° clockwise. The artwork tile
+    is cached pre-rotated, but the text is still drawn as a 640x320 landscape panel
+    and transposed on every track - two thirds of the frame. Glyph strips were not
+    adopted: quantizing per-line strips picks a different 16-color text palette and
+    breaks pixel identity. The tile and the text panel are quantized separately
+    into one shared 64-color palette.
+    """
+    print(f"Metadata: {title} - {artist} - {album}")
+    
+    # Palette layout: artwork colors first, text panel colors after them
+    composite = Image.new('P', (BAR_HEIGHT, BAR_WIDTH), 0)
+    palette = [0] * 768
+    
+    # Artwork at the top of the portrait frame (left of the landscape design)
+    tile = load_bar_artwork_tile(source, art_key)
+    if tile is not None:
+        tile_palette = tile.getpalette()[:BAR_ARTWORK_COLORS * 3]
+        palette[:len(tile_palette)] = tile_palette
+        composite.paste(tile, (0, 0))
+        print("✓ Artwork added to composite")
+    else:
+        palette[:3] = BAR_BACKGROUND  # No artwork - the tile area keeps index 0, the bar background
+    
+    # Text below it, shifting its palette indices past the artwork colors
+    panel = render_bar_text_panel(title, artist, album)
+    panel_palette = panel.getpalette()[:BAR_TEXT_COLORS * 3]
+    palette[BAR_ARTWORK_COLORS * 3:BAR_ARTWORK_COLORS * 3 + len(panel_palette)] = panel_palette
+    panel = panel.point(lambda index: index + BAR_ARTWORK_COLORS).transpose(Image.ROTATE_270)
+    composite.paste(panel, (0, BAR_ARTWORK_SIZE))
+    composite.putpalette(palette[:(BAR_ARTWORK_COLORS + BAR_TEXT_COLORS) * 3])
+    
+    print(f"✓ Composed {composite.width}x{composite.height} portrait bar")
+    return composite
+
+@safe_write
+def create_bar_artwork(source_bmp_path, bar_bmp_path, title="", artist="", album="", art_key=None):
+    """Create the rotated bar composite from a square BMP on disk (placeholders and test images)"""
+    try:
+        print(f"Creating bar composite from: {source_bmp_path}")
+        # Already indexed color (64 colors) for ESP32 processing
+        save_rendition(compose_bar_image(source_bmp_path, title, artist, album, art_key), bar_bmp_path)
+        print(f"✓ Ready for portrait display: 320x960 (no ESP32 rotation needed)")
+        return True
             
     except Exception as e:
         print(f"✗ Failed to create bar composite: {e}")
@@ -808,30 +1380,444 @@ def create_bar_artwork(source_bmp_path, bar_bmp_path, title="", artist="", album
         print(traceback.format_exc())
         return False
 
+def render_square_rendition(artwork, title, artist, album, art_key):
+    """720x720 square for the Qualia display"""
+    # Convert to 8-bit indexed color optimized for ESP32 processing
+    # Use simpler quantization for faster ESP32 loading
+    return artwork.quantize(
+        colors=64,   # Reduced from 256 - ESP32 processes fewer colors faster
+        method=0,    # Simple quantization for faster processing
+        dither=0     # No dithering - simpler for ESP32 to process
+    )
+
+# Every output produced from a decoded artwork, in render order.
+# Register new sizes here - they are rendered from the same in-memory image and cached.
+artwork_renditions = [
+    ArtworkRendition("square", render_square_rendition,
+                     {".bmp": BMP_PATH, ".rle.bmp": BMP_RLE_PATH, ".jpg": JPG_PATH}, to_qualia=True),
+    ArtworkRendition("bar", compose_bar_image,
+                     {".bmp": BMP_BAR_PATH, ".rle.bmp": BMP_BAR_RLE_PATH, ".jpg": JPG_BAR_PATH},
+                     per_track=True, required=False),
+]
+
 def save_current_metadata(title, artist, album):
     """Save current metadata to JSON file for web access with throttling"""
     global last_metadata_write
     
+    track = tuple(clean_metadata_value(value) for value in (title, artist, album))
     current_time = time.time()
-    if current_time - last_metadata_write < METADATA_WRITE_INTERVAL:
-        return  # Skip writing if too recent
+    with metadata_lock:
+        track_changed = track != metadata_state["track"]
+        metadata_state["track"] = track
+    if not track_changed and current_time - last_metadata_write < METADATA_WRITE_INTERVAL:
+        return  # Skip writing if too recent (a new track is always written right away)
     
     try:
-        metadata = {
-            "title": clean_metadata_value(title),
-            "artist": clean_metadata_value(artist),
-            "album": clean_metadata_value(album),
-            "last_updated": time.time()
+        if write_metadata_file():
+            logger.info(f"✓ Metadata saved to {METADATA_JSON_PATH}")
+        last_metadata_write = current_time
+        
+    except Exception as e:
+        logger.error(f"✗ Failed to save metadata: {e}")
+
+def write_metadata_file():
+    """Atomically replace the metadata JSON, with the immutable URLs of the last published renditions
+    
+    Returns False without touching the file when only last_updated would change: every rewrite
+    wakes the displays' /wait long-polls, so an unchanged track must not rewrite it.
+    """
+    global last_written_metadata
+    with metadata_lock:
+        title, artist, album = metadata_state["track"] or ("", "", "")
+        content = {
+            "title": title,
+            "artist": artist,
+            "album": album,
+            # Still the previous track's images while a new track renders - artwork_track names the
+            # track they were rendered for, so a reader can tell new text from matching artwork
+            "artwork": metadata_state["artwork"],
+            "artwork_track": None,
         }
+        if metadata_state["artwork_track"] is not None:
+            content["artwork_track"] = dict(zip(("title", "artist", "album"), metadata_state["artwork_track"]))
+        if content == last_written_metadata and os.path.exists(METADATA_JSON_PATH):
+            return False
         
-        with open(METADATA_JSON_PATH, 'w') as f:
+        metadata = dict(content, last_updated=time.time())
+        temp_path = METADATA_JSON_PATH + ".temp"
+        with open(temp_path, 'w') as f:
             json.dump(metadata, f, indent=2)
-        
-        last_metadata_write = current_time
-        logger.info(f"✓ Metadata saved to {METADATA_JSON_PATH}")
-        
+        os.replace(temp_path, METADATA_JSON_PATH)
+        last_written_metadata = content  # The artwork map is replaced on publish, never mutated
+        return True
+
+def publish_immutable_artwork(title="", artist="", album=""):
+    """Copy every served rendition to ART_DIR under its content hash, then advertise the URLs in the metadata"""
+    os.makedirs(ART_DIR, exist_ok=True)
+    artwork = {}
+    for rendition in artwork_renditions:
+        for suffix, path in rendition.outputs.items():
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                continue  # Rendition not produced (e.g. the bar failed) - displays keep the fixed path
+            # Same 16 hex digits the artwork server uses as the ETag of the fixed path
+            name = hashlib.sha1(data).hexdigest()[:16] + suffix
+            art_path = os.path.join(ART_DIR, name)
+            try:
+                if os.path.exists(art_path):
+                    os.utime(art_path)  # Republished - restart its retention clock
+                else:
+                    temp_path = art_path + ".temp"
+                    with open(temp_path, 'wb') as f:
+                        f.write(data)
+                    os.replace(temp_path, art_path)
+            except OSError as e:
+                logger.warning(f"Could not publish {path} as {art_path}: {e}")
+                continue
+            artwork["/" + path] = {"url": ART_URL_PREFIX + name, "size": len(data)}
+    
+    # The files exist before any metadata points at them; the URLs and their track change together
+    track = tuple(clean_metadata_value(value) for value in (title, artist, album))
+    with metadata_lock:
+        metadata_state["artwork"] = artwork
+        metadata_state["artwork_track"] = track
+        if metadata_state["track"] is None:
+            metadata_state["track"] = track
+    try:
+        write_metadata_file()
     except Exception as e:
         logger.error(f"✗ Failed to save metadata: {e}")
+    prune_immutable_artwork(set(entry["url"][len(ART_URL_PREFIX):] for entry in artwork.values()))
+
+def prune_immutable_artwork(keep):
+    """Delete content-addressed copies no longer advertised and older than ART_RETENTION"""
+    cutoff = time.time() - ART_RETENTION
+    for name in os.listdir(ART_DIR):
+        path = os.path.join(ART_DIR, name)
+        try:
+            if name not in keep and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+class RenderJobSuperseded(Exception):
+    """Raised inside a render job when a newer job has been submitted"""
+
+class RenderJob:
+    """One pending render: new artwork, a placeholder, or the blank screen"""
+
+    def __init__(self, worker, generation, kind, title="", artist="", album="", resolve=None):
+        self.worker = worker
+        self.generation = generation
+        self.kind = kind
+        self.title = title
+        self.artist = artist
+        self.album = album
+        self.resolve = resolve  # Callable returning the artwork URL (may do network lookups)
+
+    def is_stale(self):
+        return self.generation != self.worker.generation
+
+    def check(self):
+        """Cancel the job before its next expensive stage if it has been superseded"""
+        if self.is_stale():
+            raise RenderJobSuperseded(f"{self.kind} job for '{self.title}' superseded")
+
+def check_render_job(job):
+    if job is not None:
+        job.check()
+
+class ArtworkRenderWorker:
+    """Background renderer - the detection loop never blocks, only the newest job is rendered"""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.pending = None  # Single slot: a newer job replaces (drops) an older pending one
+        self.generation = 0
+        self.busy = False
+        self.metrics = {"submitted": 0, "rendered": 0, "dropped": 0, "cancelled": 0, "failed": 0}
+
+    def submit(self, kind, title="", artist="", album="", resolve=None):
+        """Queue a job, superseding anything pending or in progress"""
+        with self.condition:
+            self.generation += 1
+            if self.pending is not None:
+                self.metrics["dropped"] += 1
+                logger.info(f"Render job for '{self.pending.title}' dropped before it started")
+            self.pending = RenderJob(self, self.generation, kind, title, artist, album, resolve)
+            self.metrics["submitted"] += 1
+            self.condition.notify()
+
+    def queue_depth(self):
+        """Jobs waiting or running"""
+        return (1 if self.pending is not None else 0) + (1 if self.busy else 0)
+
+    def log_metrics(self):
+        m = self.metrics
+        logger.info(
+            f"Render worker: queue depth {self.queue_depth()}, submitted {m['submitted']}, "
+            f"rendered {m['rendered']}, dropped {m['dropped']}, cancelled {m['cancelled']}, failed {m['failed']}"
+        )
+
+    def _next_job(self):
+        with self.condition:
+            while self.pending is None:
+                self.condition.wait()
+            job = self.pending
+            self.pending = None
+            self.busy = True
+            return job
+
+    def _run(self):
+        while True:
+            job = self._next_job()
+            start_time = time.time()
+            try:
+                run_render_job(job)
+                self.metrics["rendered"] += 1
+                logger.info(f"✓ Rendered {job.kind} for '{job.title}' in {time.time() - start_time:.2f}s")
+            except RenderJobSuperseded as e:
+                self.metrics["cancelled"] += 1
+                logger.info(f"Render cancelled: {e}")
+            except Exception as e:
+                self.metrics["failed"] += 1
+                logger.error(f"Render job failed: {e}")
+                import traceback
+                logger.error(traceback.format_exc())
+            finally:
+                with self.condition:
+                    self.busy = False
+            self.log_metrics()
+
+    def start(self):
+        thread = threading.Thread(target=self._run, name="ArtworkRenderWorker", daemon=True)
+        thread.start()
+
+def run_render_job(job):
+    """Execute one render job on the worker thread"""
+    render_job_output(job)
+    publish_immutable_artwork(job.title, job.artist, job.album)
+
+def render_job_output(job):
+    """Write the served renditions for one job"""
+    if job.kind == "blank":
+        if create_blank_screen(BMP_PATH):
+            copy_to_qualia(BMP_PATH)
+        publish_extra_encodings()
+        return
+
+    if job.kind == "placeholder":
+        use_random_placeholder_image(BMP_PATH, job.title, job.artist, job.album)
+        publish_extra_encodings()
+        return
+
+    # Artwork lookups (Control API, SiriusXM, iTunes) happen here, off the detection loop
+    try:
+        art_url = job.resolve() if job.resolve else None
+        job.check()
+        if art_url:
+            download_and_convert_artwork(art_url, BMP_PATH, job.title, job.artist, job.album, job=job)
+            return
+        print("No artwork found from any source, using random placeholder image...")
+    except RenderJobSuperseded:
+        raise
+    except Exception as e:
+        # Still publish something for this song - otherwise the displays keep the previous cover
+        logger.error(f"Artwork failed for '{job.title}', using random placeholder image: {e}")
+    use_random_placeholder_image(BMP_PATH, job.title, job.artist, job.album)
+    publish_extra_encodings()
+
+render_worker = ArtworkRenderWorker()
+
+class SpeakerDirectory:
+    """Cached speaker name -> SoCo handle map, refreshed in the background instead of every loop"""
+
+    def __init__(self, cache_file=SPEAKER_CACHE_FILE):
+        self.cache_file = cache_file
+        self.speakers = {}
+        self.lock = threading.Lock()
+        self.refresh_requested = threading.Event()
+        self.last_refresh = 0
+
+    def load_last_known(self):
+        """Create handles for the persisted speaker IPs (no network traffic)"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r') as f:
+                    last_known = json.load(f)
+                with self.lock:
+                    self.speakers = {name: soco.SoCo(ip) for name, ip in last_known.items()}
+                logger.info(f"✓ Loaded {len(last_known)} last-known speaker(s) from {self.cache_file}")
+        except (json.JSONDecodeError, IOError, ValueError) as e:
+            logger.warning(f"Error loading speaker cache file: {e}")
+
+    def save_last_known(self):
+        """Persist speaker IPs so the next startup can skip discovery"""
+        try:
+            with self.lock:
+                last_known = {name: speaker.ip_address for name, speaker in self.speakers.items()}
+            with open(self.cache_file, 'w') as f:
+                json.dump(last_known, f, indent=2)
+        except IOError as e:
+            logger.warning(f"Error saving speaker cache file: {e}")
+
+    def refresh(self):
+        """Rebuild the map from zone topology, falling back to SSDP discovery"""
+        zones = None
+        with self.lock:
+            known_speakers = list(self.speakers.values())
+
+        # Any reachable speaker can report the whole household topology
+        for speaker in known_speakers:
+            try:
+                zones = speaker.visible_zones
+                break
+            except Exception as e:
+                logger.debug(f"Topology query via {speaker.ip_address} failed: {e}")
+
+        if not zones:
+            zones = soco.discover(timeout=DISCOVERY_TIMEOUT)
+
+        self.last_refresh = time.time()
+        if not zones:
+            logger.warning("Speaker discovery found no devices")
+            return False
+
+        speakers = {zone.player_name: zone for zone in zones}
+        with self.lock:
+            self.speakers = speakers
+        self.save_last_known()
+        logger.info(f"✓ Speaker topology refreshed: {', '.join(sorted(speakers))}")
+        return True
+
+    def get(self, name):
+        """Return the cached handle for a speaker - a dictionary lookup"""
+        return self.speakers.get(name)
+
+    def invalidate(self):
+        """Ask the background thread to refresh now (e.g. after a speaker error)"""
+        self.refresh_requested.set()
+
+    def _refresh_loop(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Speaker topology refresh failed: {e}")
+            self.refresh_requested.wait(TOPOLOGY_REFRESH_INTERVAL)
+            self.refresh_requested.clear()
+            # Don't hammer the network if errors keep requesting refreshes
+            time.sleep(max(0, NETWORK_RETRY_INTERVAL - (time.time() - self.last_refresh)))
+
+    def start(self):
+        """Load last-known speakers and start the background refresh thread"""
+        self.load_last_known()
+        thread = threading.Thread(target=self._refresh_loop, name="SpeakerDirectory", daemon=True)
+        thread.start()
+
+class TrackEventListener:
+    """Wake the main loop on Sonos AVTransport/RenderingControl event notifications"""
+
+    def __init__(self, speaker):
+        self.speaker = speaker
+        self.events = queue.Queue()  # Shared by both subscriptions
+        self.subscriptions = []
+        self.renew_failed = False
+
+    def start(self):
+        """Subscribe to the speaker's events - returns False if events are unavailable"""
+        try:
+            for service in (self.speaker.avTransport, self.speaker.renderingControl):
+                subscription = service.subscribe(
+                    requested_timeout=EVENT_SUBSCRIPTION_TIMEOUT,
+                    auto_renew=True,
+                    event_queue=self.events
+                )
+                subscription.auto_renew_fail = self._on_renew_failed
+                self.subscriptions.append(subscription)
+            logger.info(f"✓ Subscribed to {self.speaker.player_name} events (safety poll every {EVENT_SAFETY_POLL_INTERVAL}s)")
+            return True
+        except Exception as e:
+            logger.warning(f"Event subscription failed, falling back to {POLL_INTERVAL}s polling: {e}")
+            self.stop()
+            return False
+
+    def stop(self):
+        """Unsubscribe from all services"""
+        for subscription in self.subscriptions:
+            try:
+                subscription.unsubscribe()
+            except Exception as e:
+                logger.debug(f"Unsubscribe failed: {e}")
+        self.subscriptions = []
+
+    def _on_renew_failed(self, exception):
+        """Called from SoCo's renewal thread - wake the loop so it can resubscribe"""
+        logger.warning(f"Event subscription renewal failed: {exception}")
+        self.renew_failed = True
+        self.events.put(None)
+
+    def is_healthy(self):
+        """True while every subscription is active"""
+        return (
+            bool(self.subscriptions) and not self.renew_failed and
+            all(subscription.is_subscribed for subscription in self.subscriptions)
+        )
+
+    def wait(self, timeout):
+        """Block until a track-relevant event arrives - returns False on timeout"""
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            try:
+                event = self.events.get(timeout=remaining)
+            except queue.Empty:
+                return False
+
+            # None is the wake-up sentinel from a failed renewal
+            if event is None or event.service.service_type == "AVTransport":
+                if event is not None:
+                    logger.debug(f"AVTransport LastChange: {sorted(event.variables.keys())}")
+                # Collapse a burst of notifications into a single refresh
+                while True:
+                    try:
+                        self.events.get_nowait()
+                    except queue.Empty:
+                        break
+                return True
+
+            # RenderingControl (volume/mute) does not affect the display
+            logger.debug(f"Ignoring {event.service.service_type} event")
+
+def ensure_event_listener(speaker):
+    """Keep a healthy event subscription for the monitored speaker"""
+    global event_listener
+
+    if not USE_EVENT_SUBSCRIPTIONS:
+        return
+
+    if event_listener is not None:
+        if event_listener.speaker.uid == speaker.uid and event_listener.is_healthy():
+            return
+        event_listener.stop()
+        event_listener = None
+
+    listener = TrackEventListener(speaker)
+    if listener.start():
+        event_listener = listener
+
+def wait_for_next_check(max_wait=None):
+    """Sleep until the next metadata check - wakes early on speaker events"""
+    if event_listener is not None and event_listener.is_healthy():
+        timeout = EVENT_SAFETY_POLL_INTERVAL if max_wait is None else max_wait
+        if event_listener.wait(timeout):
+            logger.debug("Woken by speaker event")
+        return
+    time.sleep(POLL_INTERVAL if max_wait is None else max_wait)
 
 def main():
     global last_music_detected, blank_screen_shown, current_song_title, current_song_artist, current_song_album
@@ -843,10 +1829,18 @@ def main():
     last_album = None
     
     logger.info("Starting Sonos metadata monitor...")
+    speaker_directory = SpeakerDirectory()
+    speaker_directory.start()
+    control_client = SonosControlClient()
+    bar_text_renderer.preload()
+    render_worker.start()
     logger.info("Press Ctrl+C to exit")
     logger.info(f"Will show blank screen after {MUSIC_TIMEOUT_SECONDS} seconds of no music")
-    logger.info("OPTIMIZED: Only process artwork when song changes, check every 1 second")
-    logger.info("FAST RESPONSE: 1-second polling for immediate song change detection")
+    logger.info("OPTIMIZED: Only process artwork when song changes")
+    if USE_EVENT_SUBSCRIPTIONS:
+        logger.info(f"EVENT MODE: React to speaker events, safety poll every {EVENT_SAFETY_POLL_INTERVAL} seconds")
+    else:
+        logger.info(f"FAST RESPONSE: {POLL_INTERVAL}-second polling for immediate song change detection")
     
     while True:
         try:
@@ -874,213 +1868,128 @@ def main():
             
             if time_since_music > MUSIC_TIMEOUT_SECONDS and not blank_screen_shown:
                 logger.info(f"\nNo music detected for {time_since_music:.0f} seconds, showing blank screen...")
-                if create_blank_screen(BMP_PATH):
-                    copy_to_qualia(BMP_PATH)
-                    # Clear global metadata and save empty JSON for Qualia displays
-                    current_song_title = ""
-                    current_song_artist = ""
-                    current_song_album = ""
-                    save_current_metadata("", "", "")
-                    blank_screen_shown = True
-                    logger.info("✓ Blank screen displayed with empty metadata")
-                time.sleep(10)  # Check every 10 seconds when showing blank screen
+                render_worker.submit("blank")
+                # Clear global metadata and save empty JSON for Qualia displays
+                current_song_title = ""
+                current_song_artist = ""
+                current_song_album = ""
+                save_current_metadata("", "", "")
+                blank_screen_shown = True
+                logger.info("✓ Blank screen queued with empty metadata")
+                wait_for_next_check(10)  # Check every 10 seconds (or on event) when showing blank screen
                 continue
             
-            # Get current metadata
-            try:
-                soco_devices = soco.discover()
-                if not soco_devices:
-                    current_time = time.time()
-                    if current_time - last_no_music_log > NO_MUSIC_LOG_INTERVAL:
-                        logger.warning("No Sonos devices found.")
-                        last_no_music_log = current_time
-                    time.sleep(10)  # Longer sleep when no devices
-                    continue
-            except Exception as e:
+            # Get the target speaker from the discovery cache (no SSDP per iteration)
+            speaker = speaker_directory.get(TARGET_SPEAKER_NAME)
+            if speaker is None:
+                speaker_directory.invalidate()
                 current_time = time.time()
                 if current_time - last_no_music_log > NO_MUSIC_LOG_INTERVAL:
-                    logger.warning(f"Error discovering Sonos devices: {e}")
+                    logger.warning(f"Sonos speaker '{TARGET_SPEAKER_NAME}' not found.")
                     last_no_music_log = current_time
-                time.sleep(10)
+                time.sleep(10)  # Longer sleep when no devices
                 continue
 
-            # Get metadata from Sonos Control API
-            control_api_data = get_playback_metadata_by_uid()
             music_found = False
 
-            for speaker in soco_devices:
-                if speaker.player_name != "Home Office":
-                    continue
+            logger.info(f"\n--- {TARGET_SPEAKER_NAME} ---")
+            ensure_event_listener(speaker)
+            try:
+                # Get metadata from SoCo
+                soco_track = speaker.get_current_track_info()
+                # Sonos Control API data is only fetched if SoCo is missing a field
+                control_track = LazyControlTrack(control_client, speaker.uid)
 
-                logger.info(f"\n--- {speaker.player_name} ---")
-                try:
-                    # Get metadata from SoCo
-                    soco_track = speaker.get_current_track_info()
-                    control_track = control_api_data.get(speaker.uid, {})
-
-                    # Check if music is playing FIRST
-                    if is_music_playing(soco_track, control_track):
-                        music_found = True
-                        last_music_detected = current_time
-                        if blank_screen_shown:
-                            print("Music detected again, clearing blank screen flag")
-                            blank_screen_shown = False
-                        
-                        # Only process metadata if music is actually playing
-                        # Debug: Print all available track info (only when song changes)
-                        logger.debug("\nDEBUG - Available track info:")
-                        logger.debug("SoCo track info: " + json.dumps(soco_track, indent=2))
-                        logger.debug("Control API track info: " + json.dumps(control_track, indent=2))
-
-                        # Combine metadata, preferring SoCo over Control API
-                        title = soco_track.get("title") or control_track.get("title")
-                        artist = soco_track.get("artist") or control_track.get("artist")
-                        album = soco_track.get("album") or control_track.get("album")
-                        
-                        # Try different ways to detect SiriusXM
-                        channel = control_track.get("channel")
-                        service = control_track.get("service")
-                        
-                        # Fall back to SoCo if Control API doesn't have it
-                        if not channel:
-                            channel = soco_track.get("channel")
-                        if not service:
-                            service = soco_track.get("service")
-                            
-                        uri = soco_track.get("uri", "")
-                        metadata = soco_track.get("metadata", "")
-                        
-                        print("\nDEBUG - Service detection:")
-                        print(f"Channel: {channel}")
-                        print(f"Service: {service}")
-                        print(f"URI: {uri}")
-
-                        # Try to get artwork in order of preference:
-                        # 1. SoCo album_art
-                        art_url = soco_track.get("album_art")
-                        if art_url and not art_url.startswith("http"):
-                            art_url = f"http://{speaker.ip_address}:1400{art_url}"
-
-                        # 2. Sonos Control API artwork
-                        if not art_url:
-                            art_url = control_track.get("artwork")
-
-                        # 3. SiriusXM artwork from metadata
-                        if not art_url and "siriusxm.com" in metadata:
-                            print("Found SiriusXM metadata, extracting artwork URL and channel info...")
-                            art_url, siriusxm_channel = extract_siriusxm_metadata(metadata)
-                            if art_url:
-                                print(f"Found SiriusXM artwork URL: {art_url}")
-                            if siriusxm_channel:
-                                print(f"Found SiriusXM channel: {siriusxm_channel}")
-                                channel = siriusxm_channel  # Update channel name
-
-                        # 4. SiriusXM website (if on SiriusXM)
-                        is_siriusxm = (
-                            (channel and "siriusxm" in channel.lower()) or
-                            (service and "siriusxm" in service.lower()) or
-                            (uri and "siriusxm" in uri.lower()) or
-                            "siriusxm.com" in metadata
-                        )
-                        
-                        print(f"\nDEBUG - SiriusXM detection: {is_siriusxm}")
-                        
-                        if not art_url and is_siriusxm:
-                            print("Trying SiriusXM website...")
-                            # Try to get channel name from various sources
-                            channel_name = (
-                                channel or 
-                                service or 
-                                uri.split("/")[-1] if uri else None
-                            )
-                            print(f"Using channel name: {channel_name}")
-                            art_url = get_siriusxm_artwork(channel_name, artist, title)
-
-                        # 5. Skip Spotify for now to reduce API calls
-                        # if not art_url:
-                        #     print("Trying Spotify artwork...")
-                        #     art_url = get_spotify_artwork(artist, title)
-
-                        # 6. iTunes lookup - only if no other source found
-                        if not art_url:
-                            print("No artwork from Sonos or streaming services, trying iTunes...")
-                            art_url = lookup_artwork_via_itunes(artist, title)
-
-                        print("\nFinal metadata:")
-                        print("Title:  ", title)
-                        print("Artist: ", artist)
-                        print("Album:  ", album)
-                        print("Channel:", channel)
-                        print("Service:", service)
-                        print("Artwork:", art_url or "None")
-
-                        # Save current metadata to JSON file for web access
-                        save_current_metadata(title, artist, album)
-                        
-                        # Update global metadata for bar artwork creation (clean values)
-                        current_song_title = clean_metadata_value(title)
-                        current_song_artist = clean_metadata_value(artist)
-                        current_song_album = clean_metadata_value(album)
+                # Check if music is playing FIRST
+                if is_music_playing(soco_track, control_track):
+                    music_found = True
+                    last_music_detected = current_time
+                    if blank_screen_shown:
+                        print("Music detected again, clearing blank screen flag")
+                        blank_screen_shown = False
+                    
+                    # Only process metadata if music is actually playing
+                    # Debug: Print all available track info (only when song changes)
+                    logger.debug("\nDEBUG - Available track info:")
+                    logger.debug("SoCo track info: " + json.dumps(soco_track, indent=2))
+                    logger.debug("Control API track info: " + json.dumps(control_track.peek(), indent=2))
 
-                        # Only process artwork if song has changed
-                        song_changed = (title != last_title or artist != last_artist or album != last_album)
-                        
-                        if song_changed:
-                            print(f"\n🎵 NEW SONG DETECTED! Processing artwork...")
-                            print(f"Previous: {last_title} - {last_artist}")
-                            print(f"Current:  {title} - {artist}")
-                            
-                            # Update tracking variables
-                            last_title = title
-                            last_artist = artist
-                            last_album = album
-
-                            if art_url:
-                                download_and_convert_artwork(art_url, JPG_PATH, BMP_PATH)
-                            else:
-                                print("No artwork found from any source, using random placeholder image...")
-                                use_random_placeholder_image(BMP_PATH)
-                        else:
-                            print(f"Same song playing: {title} - {artist} (skipping artwork processing)")
-                            # Still save metadata in case other info changed
-                            save_current_metadata(title, artist, album)
-                    else:
-                        # Music is not playing, reduce logging frequency
-                        current_time = time.time()
-                        if current_time - last_no_music_log > NO_MUSIC_LOG_INTERVAL:
-                            logger.debug("Music detection - Title: 'None', Position: 0:00:00, Duration: 0:00:00, State:")
-                            logger.debug("Music detection - Has title: None, Has playback: False, Is playing: False")
-                            logger.info("No music playing, skipping metadata processing")
-                            last_no_music_log = current_time
-
-                except Exception as e:
-                    print(f"Error with {speaker.player_name}: {e}")
-                    import traceback
-                    print("Full error traceback:")
-                    print(traceback.format_exc())
+                    # Combine metadata, preferring SoCo over Control API
+                    title = soco_track.get("title") or control_track.get("title")
+                    artist = soco_track.get("artist") or control_track.get("artist")
+                    album = soco_track.get("album") or control_track.get("album")
                     
-                    # Only create placeholder if we haven't processed this song yet
-                    # (avoid unnecessary processing on repeated errors for same song)
-                    current_title = None
-                    current_artist = None
-                    try:
-                        # Try to get basic title/artist even if there was an error
-                        soco_track = speaker.get_current_track_info()
-                        current_title = soco_track.get("title", "")
-                        current_artist = soco_track.get("artist", "")
-                    except:
-                        pass
+                    # Save current metadata to JSON file for web access
+                    save_current_metadata(title, artist, album)
                     
-                    # Only process placeholder if this appears to be a new song
-                    if (current_title != last_title or current_artist != last_artist) and current_title:
-                        print(f"Creating placeholder for new song: {current_title} - {current_artist}")
-                        use_random_placeholder_image(BMP_PATH)
-                        # Update tracking to prevent repeated processing
-                        last_title = current_title
-                        last_artist = current_artist
-                        last_album = None  # Unknown due to error
+                    # Update global metadata for bar artwork creation (clean values)
+                    current_song_title = clean_metadata_value(title)
+                    current_song_artist = clean_metadata_value(artist)
+                    current_song_album = clean_metadata_value(album)
+
+                    # Only process artwork if song has changed
+                    song_changed = (title != last_title or artist != last_artist or album != last_album)
+                    
+                    if song_changed:
+                        print(f"\n🎵 NEW SONG DETECTED! Processing artwork...")
+                        print(f"Previous: {last_title} - {last_artist}")
+                        print(f"Current:  {title} - {artist}")
+                        
+                        # Update tracking variables
+                        last_title = title
+                        last_artist = artist
+                        last_album = album
+
+                        # Resolve and render on the worker so detection keeps running;
+                        # a quick skip supersedes this job before its expensive stages
+                        render_worker.submit(
+                            "artwork", current_song_title, current_song_artist, current_song_album,
+                            resolve=partial(resolve_artwork_url, speaker, soco_track, control_track, title, artist, album)
+                        )
                     else:
-                        print("Skipping placeholder creation - same song or no title detected")
+                        print(f"Same song playing: {title} - {artist} (skipping artwork processing)")
+                        # Still save metadata in case other info changed
+                        save_current_metadata(title, artist, album)
+                else:
+                    # Music is not playing, reduce logging frequency
+                    current_time = time.time()
+                    if current_time - last_no_music_log > NO_MUSIC_LOG_INTERVAL:
+                        logger.debug("Music detection - Title: 'None', Position: 0:00:00, Duration: 0:00:00, State:")
+                        logger.debug("Music detection - Has title: None, Has playback: False, Is playing: False")
+                        logger.info("No music playing, skipping metadata processing")
+                        last_no_music_log = current_time
+
+            except Exception as e:
+                print(f"Error with {TARGET_SPEAKER_NAME}: {e}")
+                import traceback
+                print("Full error traceback:")
+                print(traceback.format_exc())
+                
+                # The cached handle may be stale (IP change, regrouping) - refresh topology
+                speaker_directory.invalidate()
+                
+                # Only create placeholder if we haven't processed this song yet
+                # (avoid unnecessary processing on repeated errors for same song)
+                current_title = None
+                current_artist = None
+                try:
+                    # Try to get basic title/artist even if there was an error
+                    soco_track = speaker.get_current_track_info()
+                    current_title = soco_track.get("title", "")
+                    current_artist = soco_track.get("artist", "")
+                except:
+                    pass
+                
+                # Only process placeholder if this appears to be a new song
+                if (current_title != last_title or current_artist != last_artist) and current_title:
+                    print(f"Creating placeholder for new song: {current_title} - {current_artist}")
+                    render_worker.submit("placeholder", clean_metadata_value(current_title), clean_metadata_value(current_artist))
+                    # Update tracking to prevent repeated processing
+                    last_title = current_title
+                    last_artist = current_artist
+                    last_album = None  # Unknown due to error
+                else:
+                    print("Skipping placeholder creation - same song or no title detected")
 
             # If no music was found, update the timeout tracking
             if not music_found:
@@ -1091,15 +2000,14 @@ def main():
                     last_no_music_log = current_time
                 if time_since_music > MUSIC_TIMEOUT_SECONDS and not blank_screen_shown:
                     logger.info(f"Showing blank screen after {time_since_music:.0f} seconds of no music")
-                    if create_blank_screen(BMP_PATH):
-                        copy_to_qualia(BMP_PATH)
-                        # Clear global metadata and save empty JSON for Qualia displays
-                        current_song_title = ""
-                        current_song_artist = ""
-                        current_song_album = ""
-                        save_current_metadata("", "", "")
-                        blank_screen_shown = True
-                        logger.info("✓ Blank screen displayed with empty metadata")
+                    render_worker.submit("blank")
+                    # Clear global metadata and save empty JSON for Qualia displays
+                    current_song_title = ""
+                    current_song_artist = ""
+                    current_song_album = ""
+                    save_current_metadata("", "", "")
+                    blank_screen_shown = True
+                    logger.info("✓ Blank screen queued with empty metadata")
 
         except Exception as e:
             logger.error(f"Error in main loop: {e}")
@@ -1108,9 +2016,9 @@ def main():
             logger.error(traceback.format_exc())
         
         # Only log sleep message occasionally to reduce noise
-        if iteration_count % 60 == 0:  # Log every 60 iterations (about once per minute)
-            logger.debug(f"💤 Sleeping 1 second before next check... (iteration {iteration_count})")
-        time.sleep(1)  # FAST: Check every 1 second for immediate song change detection
+        if iteration_count % 60 == 0:  # Log every 60 iterations
+            logger.debug(f"💤 Waiting for next check... (iteration {iteration_count})")
+        wait_for_next_check()  # Event mode: wake on speaker events, otherwise poll every second
 
 if __name__ == "__main__":
     main()